@@ -0,0 +1,332 @@
+"""
+Load-test one inspection API and write latency / throughput / memory as JSON.
+
+    python -m benchmarks.run --target production_api --stub \\
+        --workload image --workload video --concurrency 8 --requests 400 \\
+        --output bench-results/production_api.json
+
+The server is started in a subprocess (``benchmarks.serve``) unless
+``--url`` points at one that is already running. Load is closed-loop:
+``--concurrency`` keep-alive connections each send the next request as
+soon as the previous one returns.
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+
+import numpy as np
+
+from benchmarks import workloads
+from benchmarks.serve import REPO_ROOT, TARGETS
+
+# -----------------------
+# Server process
+# -----------------------
+
+
+class Connection(http.client.HTTPConnection):
+    """Keep-alive connection without Nagle (avoids 40 ms delayed-ACK stalls)."""
+
+    def connect(self):
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+def start_server(target, stub, port, server_env):
+    env = dict(os.environ, **server_env)
+    command = [sys.executable, "-m", "benchmarks.serve", "--target", target, "--port", str(port)]
+    if stub:
+        command.append("--stub")
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def wait_ready(host, port, path, proc=None, timeout=300.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode} before becoming ready.")
+        try:
+            conn = Connection(host, port, timeout=2)
+            conn.request("GET", path)
+            status = conn.getresponse().status
+            conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Server not ready on {host}:{port}{path} after {timeout:.0f}s.")
+
+
+class RssSampler(threading.Thread):
+    """Peak resident memory of a process, from /proc (Linux only)."""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop_event = threading.Event()
+
+    def _read(self, field):
+        try:
+            with open(f"/proc/{self.pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith(field + ":"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak_kb = max(self.peak_kb, self._read("VmRSS"))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        # Kernel high-water mark also covers spikes between samples
+        self.peak_kb = max(self.peak_kb, self._read("VmHWM"))
+        return round(self.peak_kb / 1024, 1) if self.peak_kb else None
+
+
+# -----------------------
+# Load generator
+# -----------------------
+
+
+def generate_load(host, port, requests, concurrency, total=None, duration=None, timeout=300.0):
+    """Closed-loop load; returns (latencies_s, statuses, errors, wall_s)."""
+
+    lock = threading.Lock()
+    issued = [0]
+    deadline = time.monotonic() + duration if duration else None
+
+    latencies = []
+    statuses = Counter()
+    errors = Counter()
+
+    def next_index():
+        with lock:
+            if total is not None and issued[0] >= total:
+                return None
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            issued[0] += 1
+            return issued[0] - 1
+
+    def worker():
+        conn = Connection(host, port, timeout=timeout)
+        while True:
+            index = next_index()
+            if index is None:
+                break
+
+            request = requests[index % len(requests)]
+            started = time.perf_counter()
+            try:
+                conn.request(request.method, request.path, request.body, request.headers)
+                response = conn.getresponse()
+                response.read()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    statuses[response.status] += 1
+                    if 200 <= response.status < 300:
+                        latencies.append(elapsed)
+            except (OSError, http.client.HTTPException) as e:
+                with lock:
+                    errors[type(e).__name__] += 1
+                conn.close()
+                conn = Connection(host, port, timeout=timeout)
+        conn.close()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return latencies, statuses, errors, time.perf_counter() - started
+
+
+def summarize(latencies, statuses, errors, wall_s) -> dict:
+    ms = np.asarray(latencies, dtype=np.float64) * 1000.0
+    completed = int(ms.size)
+
+    latency = None
+    if completed:
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        latency = {
+            "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3),
+            "p99": round(float(p99), 3),
+            "mean": round(float(ms.mean()), 3),
+            "max": round(float(ms.max()), 3),
+        }
+
+    return {
+        "completed": completed,
+        "failed": int(sum(statuses.values()) - completed + sum(errors.values())),
+        "duration_s": round(wall_s, 3),
+        "rps": round(completed / wall_s, 3) if wall_s > 0 else 0.0,
+        "latency_ms": latency,
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "errors": dict(errors),
+    }
+
+
+# -----------------------
+# CLI
+# -----------------------
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", choices=sorted(TARGETS), required=True)
+    parser.add_argument("--stub", action="store_true", help="deterministic stub models instead of real weights")
+    parser.add_argument("--workload", action="append", help="repeatable; default: image")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per workload")
+    parser.add_argument("--duration", type=float, help="seconds per workload (overrides --requests)")
+    parser.add_argument("--warmup", type=int, default=10, help="unrecorded requests per workload")
+    parser.add_argument("--payloads", type=int, help="distinct payloads to cycle through")
+    parser.add_argument("--image-size", default="1280x720", help="WxH of synthetic images")
+    parser.add_argument("--video-frames", type=int, default=60)
+    parser.add_argument("--tabular-features", help="JSON file with one feature dict")
+    parser.add_argument(
+        "--server-env", action="append", default=[], metavar="KEY=VALUE",
+        help="extra environment for the spawned server (e.g. RESULT_CACHE_SIZE=0)",
+    )
+    parser.add_argument("--url", help="benchmark an already running server instead")
+    parser.add_argument("--pid", type=int, help="server pid for peak RSS when using --url")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--output", help="JSON result path (default: stdout)")
+    return parser.parse_args()
+
+
+def payload_options(args, workload):
+    width, height = (int(v) for v in args.image_size.lower().split("x"))
+    options = {}
+    if args.payloads:
+        options["count"] = args.payloads
+    if workload.startswith("image"):
+        options.update(width=width, height=height)
+    if workload == "video":
+        options["frames"] = args.video_frames
+    if workload == "tabular" and args.tabular_features:
+        with open(args.tabular_features, "r", encoding="utf-8") as f:
+            options["features"] = json.load(f)
+    return options
+
+
+def main():
+    args = parse_args()
+    workload_names = args.workload or ["image"]
+    server_env = dict(item.split("=", 1) for item in args.server_env)
+
+    proc = None
+    if args.url:
+        parsed = urllib.parse.urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+        pid = args.pid
+    else:
+        host, port = "127.0.0.1", args.port
+        proc = start_server(args.target, args.stub, port, server_env)
+        pid = proc.pid
+
+    results = []
+    try:
+        wait_ready(host, port, workloads.READY_PATHS[args.target], proc, args.timeout)
+
+        for name in workload_names:
+            endpoint, requests = workloads.build(args.target, name, **payload_options(args, name))
+
+            if args.warmup:
+                generate_load(host, port, requests, 1, total=args.warmup, timeout=args.timeout)
+
+            sampler = RssSampler(pid) if pid else None
+            if sampler is not None:
+                sampler.start()
+
+            measured = generate_load(
+                host,
+                port,
+                requests,
+                args.concurrency,
+                total=None if args.duration else args.requests,
+                duration=args.duration,
+                timeout=args.timeout,
+            )
+
+            summary = summarize(*measured)
+            summary["peak_rss_mb"] = sampler.stop() if sampler is not None else None
+            results.append(
+                {
+                    "workload": name,
+                    "endpoint": endpoint,
+                    "concurrency": args.concurrency,
+                    "payloads": len(requests),
+                    **summary,
+                }
+            )
+            print(
+                f"[bench] {args.target} {name}: {summary['rps']} rps, "
+                f"p50={summary['latency_ms'] and summary['latency_ms']['p50']}ms, "
+                f"failed={summary['failed']}",
+                file=sys.stderr,
+            )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    report = {
+        "target": args.target,
+        "stub_models": args.stub,
+        "git_commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "server_env": server_env,
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Start one of the inspection APIs under uvicorn, optionally with stub models.
+
+    python -m benchmarks.serve --target production_api --stub --port 8100
+
+Stubs are patched in at the library boundary (``ultralytics.YOLO``,
+``joblib.load``, ``HuggingFaceEmbeddings``, ``mlflow.pyfunc.load_model``,
+the railway HuggingFace LLM call) before the app is imported, so the
+application code itself runs unchanged.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# target -> (source dir added to sys.path, "module:attribute" of the ASGI app)
+TARGETS = {
+    "production_api": ("production_api", "app:app"),
+    "railway": ("railway_deployment", "app:app"),
+    "mlops": (os.path.join("mlops-platform", "api"), "app.main:app"),
+}
+
+
+def _patch_models():
+    import joblib
+    import ultralytics
+
+    from benchmarks import stubs
+
+    ultralytics.YOLO = stubs.FakeYOLO
+    joblib.load = lambda *args, **kwargs: stubs.FakeSeverityModel()
+
+
+def _prepare_production_api(stub: bool):
+    if not stub:
+        os.chdir(os.path.join(REPO_ROOT, "production_api"))
+        return
+
+    import langchain_community.embeddings
+
+    from benchmarks import stubs
+
+    _patch_models()
+    langchain_community.embeddings.HuggingFaceEmbeddings = stubs.fake_embeddings
+
+    # Self-contained working dir: dummy weights file (hashed for the model
+    # version label), local FAISS store, caches and outputs
+    workdir = tempfile.mkdtemp(prefix="bench-production-api-")
+    os.makedirs(os.path.join(workdir, "model"))
+    with open(os.path.join(workdir, "model", "best.pt"), "wb") as f:
+        f.write(b"stub-weights")
+    stubs.build_faiss_index(os.path.join(workdir, "rag", "sop_db"))
+
+    os.environ.setdefault("SLACK_MAX_ATTEMPTS", "1")
+    os.environ.setdefault("MODEL_VERSION", "stub")
+    os.chdir(workdir)
+
+
+def _prepare_railway(stub: bool):
+    os.chdir(os.path.join(REPO_ROOT, "railway_deployment"))
+    if stub:
+        import llm.rag_pipeline
+
+        from benchmarks import stubs
+
+        _patch_models()
+        # The real call goes out to the HuggingFace inference API
+        llm.rag_pipeline.query_llm = lambda prompt: [
+            {"generated_text": stubs.SOP_TEXTS[len(prompt) % len(stubs.SOP_TEXTS)]}
+        ]
+
+
+def _prepare_mlops(stub: bool):
+    os.chdir(os.path.join(REPO_ROOT, "mlops-platform"))
+    if stub:
+        import mlflow.pyfunc
+
+        from benchmarks import stubs
+
+        # Empty local file store: registry lookups fail fast and the model
+        # manager falls back to loading by stage (served by the stub)
+        store = tempfile.mkdtemp(prefix="bench-mlflow-")
+        os.environ["MLFLOW_TRACKING_URI"] = "file:" + store
+        mlflow.pyfunc.load_model = lambda model_uri, **kwargs: stubs.FakePyfunc(model_uri)
+
+
+PREPARE = {
+    "production_api": _prepare_production_api,
+    "railway": _prepare_railway,
+    "mlops": _prepare_mlops,
+}
+
+
+def load_app(target: str, stub: bool):
+    source_dir, app_ref = TARGETS[target]
+
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, os.path.join(REPO_ROOT, source_dir))
+    PREPARE[target](stub)
+
+    module_name, attribute = app_ref.split(":")
+    module = __import__(module_name, fromlist=[attribute])
+    return getattr(module, attribute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=sorted(TARGETS), required=True)
+    parser.add_argument("--stub", action="store_true", help="use deterministic stub models")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    app = load_app(args.target, args.stub)
+
+    import uvicorn
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
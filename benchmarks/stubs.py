@@ -0,0 +1,264 @@
+"""
+Deterministic stand-ins for the heavy models, so the APIs can be load-tested
+without weights, a GPU or network access.
+
+- ``FakeYOLO``: same call surface the apps use (``predict``, ``__call__``,
+  ``to``, ``fuse``), returns fixed boxes scaled to the input image
+- ``FakeSeverityModel``: constant severity score
+- ``FakeEmbeddings``: hash-seeded unit vectors (LangChain ``Embeddings``)
+- ``FakePyfunc``: MLflow pyfunc stand-in for the mlops-platform routers
+
+``STUB_LATENCY_MS`` (per image) adds a fixed sleep to every fake YOLO call
+to mimic model compute.
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+
+EMBEDDING_DIM = 384
+
+# (class_id, confidence, x1, y1, x2, y2) relative to image size
+FIXED_BOXES = np.array(
+    [
+        [0, 0.91, 0.10, 0.10, 0.30, 0.35],
+        [1, 0.82, 0.50, 0.20, 0.80, 0.60],
+        [3, 0.64, 0.15, 0.60, 0.40, 0.90],
+    ],
+    dtype=np.float32,
+)
+
+SOP_TEXTS = [
+    "LOW risk: log the inspection and release the container.",
+    "MEDIUM risk: photograph the damage, notify the yard supervisor, repair before next loading.",
+    "HIGH risk: hold the shipment, quarantine the container and open a damage claim.",
+    "Leak detected: isolate cargo, check seals and inspect for contamination.",
+    "Broken door: secure with temporary lock, do not load until repaired.",
+]
+
+STUB_LATENCY_MS = float(os.getenv("STUB_LATENCY_MS", "0"))
+
+
+# -----------------------
+# YOLO
+# -----------------------
+
+
+class _HostArray(np.ndarray):
+    """ndarray with the ``.cpu().numpy()`` chain torch tensors offer."""
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return np.asarray(self)
+
+
+def _host(array) -> _HostArray:
+    return np.asarray(array).view(_HostArray)
+
+
+class FakeBox:
+    __slots__ = ("cls", "conf", "xyxy")
+
+    def __init__(self, row):
+        self.xyxy = _host(row[None, :4])
+        self.conf = _host(row[4:5])
+        self.cls = _host(row[5:6])
+
+
+class FakeBoxes:
+    def __init__(self, data: np.ndarray):
+        # columns: x1, y1, x2, y2, conf, cls (ultralytics layout)
+        self.data = _host(data)
+
+    def __len__(self):
+        return int(self.data.shape[0])
+
+    def __iter__(self):
+        return (FakeBox(row) for row in np.asarray(self.data))
+
+
+class FakeResult:
+    def __init__(self, image, data, speed):
+        self.orig_img = image
+        self.orig_shape = image.shape[:2]
+        self.boxes = FakeBoxes(data)
+        self.speed = speed
+
+    def plot(self):
+        import cv2
+
+        canvas = self.orig_img.copy()
+        for x1, y1, x2, y2, _, _ in np.asarray(self.boxes.data).astype(int):
+            cv2.rectangle(canvas, (x1, y1), (x2, y2), (0, 0, 255), 2)
+        return canvas
+
+    def save(self, filename):
+        import cv2
+
+        cv2.imwrite(filename, self.plot())
+        return filename
+
+
+def _load_image(source):
+    if isinstance(source, np.ndarray):
+        return source
+
+    import cv2
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        image = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_COLOR)
+    else:
+        image = cv2.imread(str(source))
+    if image is None:
+        raise ValueError(f"Cannot read image {source!r}")
+    return image
+
+
+class FakeYOLO:
+    """Fixed detections: three boxes placed relative to the image size."""
+
+    def __init__(self, *args, **kwargs):
+        self.model = None
+
+    def to(self, device):
+        return self
+
+    def fuse(self):
+        return self
+
+    def predict(self, source=None, **kwargs):
+        sources = source if isinstance(source, (list, tuple)) else [source]
+        images = [_load_image(s) for s in sources]
+
+        if STUB_LATENCY_MS:
+            time.sleep(STUB_LATENCY_MS * len(images) / 1000.0)
+
+        per_image_ms = STUB_LATENCY_MS
+        speed = {"preprocess": 0.0, "inference": per_image_ms, "postprocess": 0.0}
+
+        results = []
+        for image in images:
+            h, w = image.shape[:2]
+            data = np.empty((len(FIXED_BOXES), 6), dtype=np.float32)
+            data[:, 0:4:2] = FIXED_BOXES[:, 2:6:2] * w
+            data[:, 1:4:2] = FIXED_BOXES[:, 3:6:2] * h
+            data[:, 4] = FIXED_BOXES[:, 1]
+            data[:, 5] = FIXED_BOXES[:, 0]
+            results.append(FakeResult(image, data, dict(speed)))
+        return results
+
+    __call__ = predict
+
+
+# -----------------------
+# Tabular / severity
+# -----------------------
+
+
+class FakeSeverityModel:
+    def __init__(self, score: float = 0.6):
+        self.score = score
+
+    def predict(self, X):
+        return np.full(len(X), self.score)
+
+    def predict_proba(self, X):
+        n = len(X)
+        return np.column_stack([np.full(n, 1 - self.score), np.full(n, self.score)])
+
+
+# -----------------------
+# Embeddings / FAISS
+# -----------------------
+
+
+def _vector(text: str):
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+    v = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM).astype(np.float32)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+def fake_embeddings(*args, **kwargs):
+    """LangChain-compatible embedder (imported lazily: langchain is optional here)."""
+
+    from langchain_core.embeddings import Embeddings
+
+    class FakeEmbeddings(Embeddings):
+        def embed_query(self, text):
+            return _vector(text)
+
+        def embed_documents(self, texts):
+            return [_vector(t) for t in texts]
+
+    return FakeEmbeddings()
+
+
+def build_faiss_index(folder: str):
+    """Local FAISS store over SOP_TEXTS, saved like the real ``rag/sop_db``."""
+
+    from langchain_community.vectorstores import FAISS
+
+    FAISS.from_texts(SOP_TEXTS, fake_embeddings()).save_local(folder)
+    return folder
+
+
+# -----------------------
+# MLflow pyfunc (mlops-platform)
+# -----------------------
+
+
+DAMAGE_NAMES = np.array(["dent", "rust", "broken_door", "leak"])
+
+
+def _columns(data: np.ndarray, names: np.ndarray) -> dict:
+    class_ids = data[:, 5].astype(np.int32)
+    return {
+        "xyxy": np.ascontiguousarray(data[:, :4]),
+        "confidence": np.ascontiguousarray(data[:, 4]),
+        "class_id": class_ids,
+        "class_name": names[class_ids],
+    }
+
+
+class _FakeMetadata:
+    def get_input_schema(self):
+        return None
+
+
+class FakePyfunc:
+    """Answers for whichever registered model name it stands in for."""
+
+    def __init__(self, model_uri: str):
+        self.model_uri = model_uri
+        self.metadata = _FakeMetadata()
+        self._yolo = FakeYOLO()
+        self._tabular = FakeSeverityModel()
+
+    def _predict_yolo(self, data):
+        # Same columnar output as YOLOv8ModelWrapper (one dict per image)
+        sources = data if isinstance(data, (list, tuple)) else [data]
+        outputs = []
+        for result in self._yolo.predict(sources):
+            h, w = result.orig_shape
+            container = np.array([[0.0, 0.0, w, h, 0.97, 0.0]], dtype=np.float32)
+            outputs.append(
+                {
+                    "containers": _columns(container, np.array(["container"])),
+                    "damage": _columns(np.asarray(result.boxes.data), DAMAGE_NAMES),
+                }
+            )
+        return outputs
+
+    def predict(self, data, *args, **kwargs):
+        if "yolo" in self.model_uri:
+            return self._predict_yolo(data)
+        if "rag" in self.model_uri or "faiss" in self.model_uri:
+            return SOP_TEXTS[int(hashlib.sha256(str(data).encode()).digest()[0]) % len(SOP_TEXTS)]
+        return self._tabular.predict(data)
+
+    def predict_proba(self, X):
+        return self._tabular.predict_proba(X)
@@ -0,0 +1,185 @@
+"""Synthetic, seeded request payloads for each target API."""
+
+import json
+import os
+import tempfile
+import urllib.parse
+
+import numpy as np
+
+BOUNDARY = "----inspection-benchmark-boundary"
+
+# Same feature layout as the severity model in production_api
+DEFAULT_TABULAR_FEATURES = {
+    "avg_confidence": 0.78,
+    "total_damage_area": 0.12,
+    "detection_count": 3.0,
+}
+
+RAG_QUERIES = [
+    "What should we do with a container with heavy rust on the door?",
+    "Leak detected near the floor of a reefer container, next steps?",
+    "Minor dent on the side panel, can it be loaded?",
+    "Broken door lock found during gate inspection.",
+]
+
+
+class Request:
+    __slots__ = ("method", "path", "body", "headers")
+
+    def __init__(self, method, path, body=b"", headers=None):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.headers = headers or {}
+
+
+def multipart(field: str, filename: str, content: bytes, content_type: str) -> Request:
+    body = (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8") + content + f"\r\n--{BOUNDARY}--\r\n".encode("utf-8")
+
+    return Request(
+        "POST",
+        None,
+        body,
+        {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+    )
+
+
+# -----------------------
+# Payload generators
+# -----------------------
+
+
+def synthetic_frame(rng, width, height):
+    """Container-ish frame: flat panels plus a few damage-coloured patches."""
+
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:] = rng.integers(40, 200, size=3, dtype=np.uint8)
+    for _ in range(4):
+        x, y = rng.integers(0, width - 40), rng.integers(0, height - 40)
+        w, h = rng.integers(20, max(21, width // 4)), rng.integers(20, max(21, height // 4))
+        frame[y : y + h, x : x + w] = rng.integers(0, 255, size=3, dtype=np.uint8)
+    noise = rng.integers(0, 12, size=frame.shape, dtype=np.int16)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def image_payloads(count=16, width=1280, height=720, quality=90, seed=0, **_):
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for i in range(count):
+        ok, jpeg = cv2.imencode(
+            ".jpg", synthetic_frame(rng, width, height), [cv2.IMWRITE_JPEG_QUALITY, quality]
+        )
+        if not ok:
+            raise RuntimeError("Failed to encode synthetic image")
+        payloads.append(multipart("file", f"bench_{i:04d}.jpg", jpeg.tobytes(), "image/jpeg"))
+    return payloads
+
+
+def video_payloads(count=1, frames=60, width=640, height=360, fps=15, seed=0, **_):
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for i in range(count):
+        fd, path = tempfile.mkstemp(suffix=".mp4")
+        os.close(fd)
+        try:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+            base = synthetic_frame(rng, width, height)
+            for t in range(frames):
+                # Slow pan so motion gating sees realistic, mostly static footage
+                writer.write(np.roll(base, shift=t * 2, axis=1))
+            writer.release()
+            with open(path, "rb") as f:
+                content = f.read()
+        finally:
+            os.remove(path)
+        payloads.append(multipart("file", f"bench_{i:04d}.mp4", content, "video/mp4"))
+    return payloads
+
+
+def tabular_payloads(count=64, features=None, seed=0, **_):
+    rng = np.random.default_rng(seed)
+    base = features or DEFAULT_TABULAR_FEATURES
+    payloads = []
+    for _i in range(count):
+        row = {k: round(float(v) * float(rng.uniform(0.5, 1.5)), 4) for k, v in base.items()}
+        payloads.append(
+            Request(
+                "POST",
+                None,
+                json.dumps({"features": row}).encode("utf-8"),
+                {"Content-Type": "application/json"},
+            )
+        )
+    return payloads
+
+
+def rag_json_payloads(count=len(RAG_QUERIES), **_):
+    return [
+        Request(
+            "POST",
+            None,
+            json.dumps({"query": RAG_QUERIES[i % len(RAG_QUERIES)]}).encode("utf-8"),
+            {"Content-Type": "application/json"},
+        )
+        for i in range(count)
+    ]
+
+
+def rag_query_payloads(count=len(RAG_QUERIES), **_):
+    # railway /predict/llm takes the prompt as a query parameter
+    return [
+        Request("POST", "?" + urllib.parse.urlencode({"prompt": RAG_QUERIES[i % len(RAG_QUERIES)]}))
+        for i in range(count)
+    ]
+
+
+# -----------------------
+# Target routing
+# -----------------------
+
+# target -> workload -> (endpoint, payload generator)
+WORKLOADS = {
+    "production_api": {
+        "image": ("/inspect-image", image_payloads),
+        "image_visual": ("/inspect-image-visual", image_payloads),
+        "video": ("/inspect-video", video_payloads),
+    },
+    "railway": {
+        "image": ("/predict/vision", image_payloads),
+        "rag": ("/predict/llm", rag_query_payloads),
+    },
+    "mlops": {
+        "image": ("/detect/yolo", image_payloads),
+        "tabular": ("/tabular/predict", tabular_payloads),
+        "rag": ("/rag/query", rag_json_payloads),
+    },
+}
+
+# Polled until 200 before any load is sent
+READY_PATHS = {"production_api": "/ready", "railway": "/", "mlops": "/ready"}
+
+
+def build(target: str, workload: str, **options):
+    """Requests for one workload; ``options`` go to the payload generator."""
+
+    try:
+        endpoint, generator = WORKLOADS[target][workload]
+    except KeyError:
+        supported = ", ".join(sorted(WORKLOADS.get(target, {})))
+        raise ValueError(
+            f"Workload {workload!r} is not available for {target!r} (supported: {supported})."
+        ) from None
+
+    requests = generator(**options)
+    for request in requests:
+        request.path = endpoint + (request.path or "")
+    return endpoint, requests
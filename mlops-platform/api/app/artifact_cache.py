@@ -0,0 +1,357 @@
+"""
+Persistent, content-addressed cache of MLflow model artifacts.
+
+    root/
+      blobs/<sha256>                          one file per unique content
+      entries/<name>-v<version>-<digest16>/   model dir, hard links into blobs/
+      index.json                              versions, stage pointers, LRU clock
+
+A model version is downloaded once, split into content-addressed blobs
+(identical weights shared by several versions are stored once) and
+materialized as a plain directory that ``mlflow.pyfunc.load_model`` can
+open without the registry. The cache is bounded by ``max_bytes``; least
+recently used entries are evicted first. Several workers (or pods on a
+shared volume) can use the same root: index updates take a file lock.
+
+Smoke test against a local file store:
+
+    MLFLOW_TRACKING_URI=file:./mlruns python -m app.artifact_cache \\
+        fetch container_yolov8_multi_task_model --stage Production
+"""
+
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+INDEX_VERSION = 1
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Size-bounded LRU cache of model versions keyed by name, version and content digest."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = os.path.abspath(root)
+        self.max_bytes = int(max_bytes)
+
+        self.blobs_dir = os.path.join(self.root, "blobs")
+        self.entries_dir = os.path.join(self.root, "entries")
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        for folder in (self.blobs_dir, self.entries_dir, self.tmp_dir):
+            os.makedirs(folder, exist_ok=True)
+
+        self._index_path = os.path.join(self.root, "index.json")
+        self._lock_path = os.path.join(self.root, ".lock")
+        self._thread_lock = threading.Lock()
+
+        # Per-process statistics
+        self.hits = 0
+        self.misses = 0
+        self.downloaded_bytes = 0
+        self.evictions = 0
+
+    # =========================
+    # Index (file-locked across processes)
+    # =========================
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._thread_lock, open(self._lock_path, "a+") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") == INDEX_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"format": INDEX_VERSION, "entries": {}, "versions": {}, "stages": {}}
+
+    def _write_index(self, index: dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self._index_path)
+
+    @staticmethod
+    def _key(name: str, version) -> str:
+        return f"{name}/{version}"
+
+    # =========================
+    # Lookup / fetch
+    # =========================
+    def lookup(self, name: str, version):
+        """Local model dir for (name, version), or None. Counts as a use for LRU."""
+
+        with self._locked():
+            index = self._read_index()
+            entry_id = index["versions"].get(self._key(name, version))
+            entry = index["entries"].get(entry_id)
+
+            if entry is None or not self._entry_intact(entry_id, entry):
+                return None
+
+            entry["last_used"] = time.time()
+            self._write_index(index)
+
+        self.hits += 1
+        return os.path.join(self.entries_dir, entry_id)
+
+    def fetch(self, name: str, version, download, keep=()):
+        """
+        Model dir for (name, version), downloading on a miss.
+
+        Args:
+            download: callable(dst_dir) -> local path of the downloaded model dir.
+            keep: "name/version" keys that must survive eviction (e.g. live models).
+
+        Returns:
+            (path, hit)
+        """
+        path = self.lookup(name, version)
+        if path is not None:
+            return path, True
+
+        self.misses += 1
+        staging = tempfile.mkdtemp(dir=self.tmp_dir)
+        try:
+            downloaded = download(staging)
+            files = self._hash_tree(downloaded)
+            path = self._commit(name, version, downloaded, files, keep)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        return path, False
+
+    def _hash_tree(self, folder: str) -> dict:
+        """relative path -> [sha256, size] for every file under ``folder``."""
+
+        files = {}
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                rel = os.path.relpath(path, folder).replace(os.sep, "/")
+                files[rel] = [file_sha256(path), os.path.getsize(path)]
+        return files
+
+    def _commit(self, name, version, downloaded, files, keep) -> str:
+        manifest = "\n".join(f"{rel}\0{sha}\0{size}" for rel, (sha, size) in sorted(files.items()))
+        digest = hashlib.sha256(manifest.encode("utf-8")).hexdigest()
+        entry_id = f"{name}-v{version}-{digest[:16]}"
+        entry_dir = os.path.join(self.entries_dir, entry_id)
+
+        with self._locked():
+            index = self._read_index()
+
+            for rel, (sha, _) in files.items():
+                blob = os.path.join(self.blobs_dir, sha)
+                if not os.path.exists(blob):
+                    # Same filesystem (staging lives under root): a rename, no copy
+                    os.replace(os.path.join(downloaded, rel), blob)
+                    os.chmod(blob, 0o444)
+
+            if not os.path.isdir(entry_dir):
+                building = tempfile.mkdtemp(dir=self.tmp_dir)
+                for rel, (sha, _) in files.items():
+                    target = os.path.join(building, rel)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    self._link(os.path.join(self.blobs_dir, sha), target)
+                os.replace(building, entry_dir)
+
+            now = time.time()
+            index["entries"][entry_id] = {
+                "name": name,
+                "version": str(version),
+                "digest": digest,
+                "files": files,
+                "bytes": sum(size for _, size in files.values()),
+                "created": now,
+                "last_used": now,
+            }
+            index["versions"][self._key(name, version)] = entry_id
+            self.downloaded_bytes += index["entries"][entry_id]["bytes"]
+
+            self._evict(index, keep=set(keep) | {self._key(name, version)})
+            self._write_index(index)
+
+        return entry_dir
+
+    @staticmethod
+    def _link(source: str, target: str):
+        try:
+            os.link(source, target)
+        except OSError:
+            # Filesystems without hard links get a copy
+            shutil.copy2(source, target)
+
+    def _entry_intact(self, entry_id: str, entry: dict) -> bool:
+        """Cheap check (existence and size) so a half-deleted entry is re-downloaded."""
+
+        entry_dir = os.path.join(self.entries_dir, entry_id)
+        for rel, (_, size) in entry["files"].items():
+            try:
+                if os.path.getsize(os.path.join(entry_dir, rel)) != size:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    # =========================
+    # Stage pointers (offline mode)
+    # =========================
+    def record_stage(self, name: str, stage: str, version):
+        """Remember which version ``stage`` resolved to, for use without the registry."""
+
+        with self._locked():
+            index = self._read_index()
+            stages = index["stages"].setdefault(name, {})
+            if stages.get(stage) != str(version):
+                stages[stage] = str(version)
+                self._write_index(index)
+
+    def stage_version(self, name: str, stage: str):
+        """Last known version of ``stage`` that is still cached, else the newest cached one."""
+
+        index = self._read_index()
+        cached = {
+            entry["version"]
+            for entry_id, entry in index["entries"].items()
+            if entry["name"] == name
+        }
+        version = index["stages"].get(name, {}).get(stage)
+        if version in cached:
+            return version
+        return max(cached, key=lambda v: int(v) if v.isdigit() else -1) if cached else None
+
+    # =========================
+    # Eviction
+    # =========================
+    def _evict(self, index: dict, keep=()):
+        """Drop least recently used entries until unique blob bytes fit in max_bytes."""
+
+        def referenced():
+            sizes = {}
+            for entry in index["entries"].values():
+                for sha, size in entry["files"].values():
+                    sizes[sha] = size
+            return sizes
+
+        blob_sizes = referenced()
+        total = sum(blob_sizes.values())
+
+        candidates = sorted(
+            (
+                (entry["last_used"], entry_id)
+                for entry_id, entry in index["entries"].items()
+                if self._key(entry["name"], entry["version"]) not in keep
+            ),
+        )
+
+        for _, entry_id in candidates:
+            if total <= self.max_bytes:
+                break
+
+            entry = index["entries"].pop(entry_id)
+            key = self._key(entry["name"], entry["version"])
+            if index["versions"].get(key) == entry_id:
+                del index["versions"][key]
+            shutil.rmtree(os.path.join(self.entries_dir, entry_id), ignore_errors=True)
+            self.evictions += 1
+
+            blob_sizes = referenced()
+            total = sum(blob_sizes.values())
+
+        # Blobs no entry points at anymore (including ones orphaned by crashes)
+        for sha in os.listdir(self.blobs_dir):
+            if sha not in blob_sizes:
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.blobs_dir, sha))
+
+    def prune(self, keep=()):
+        with self._locked():
+            index = self._read_index()
+            self._evict(index, keep=set(keep))
+            self._write_index(index)
+
+    def stats(self) -> dict:
+        index = self._read_index()
+        unique = {}
+        for entry in index["entries"].values():
+            for sha, size in entry["files"].values():
+                unique[sha] = size
+
+        return {
+            "root": self.root,
+            "max_bytes": self.max_bytes,
+            "bytes": sum(unique.values()),
+            "entries": sorted(index["entries"]),
+            "stages": index["stages"],
+            "hits": self.hits,
+            "misses": self.misses,
+            "downloaded_bytes": self.downloaded_bytes,
+            "evictions": self.evictions,
+        }
+
+
+def main():
+    import mlflow
+    from mlflow.tracking import MlflowClient
+
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="Pre-fetch or inspect the local MLflow artifact cache.")
+    parser.add_argument("command", choices=("fetch", "stats", "prune"))
+    parser.add_argument("model", nargs="?")
+    parser.add_argument("--version")
+    parser.add_argument("--stage", default=settings.MLFLOW_MODEL_STAGE)
+    args = parser.parse_args()
+
+    cache = ArtifactCache(settings.ARTIFACT_CACHE_DIR, int(settings.ARTIFACT_CACHE_MAX_GB * 1024**3))
+
+    if args.command == "fetch":
+        if not args.model:
+            parser.error("fetch needs a model name")
+
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", settings.MLFLOW_TRACKING_URI))
+        version = args.version
+        if version is None:
+            versions = MlflowClient().get_latest_versions(args.model, stages=[args.stage])
+            version = max(versions, key=lambda v: int(v.version)).version
+            cache.record_stage(args.model, args.stage, version)
+
+        started = time.perf_counter()
+        path, hit = cache.fetch(
+            args.model,
+            version,
+            lambda dst: mlflow.artifacts.download_artifacts(
+                artifact_uri=f"models:/{args.model}/{version}", dst_path=dst
+            ),
+        )
+        print(json.dumps({"path": path, "hit": hit, "seconds": round(time.perf_counter() - started, 3)}))
+    elif args.command == "prune":
+        cache.prune()
+
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -56,6 +56,34 @@ class Settings(BaseSettings):
         description="Timeout (seconds) for MLflow model loading"
     )
 
+    MODEL_POLL_INTERVAL: int = Field(
+        60,
+        description="Seconds between registry polls for new versions (0 = never)"
+    )
+
+    MODEL_PRELOAD: bool = Field(
+        True,
+        description="Load all models at startup instead of on first request"
+    )
+
+    # =========================
+    # Local artifact cache
+    # =========================
+    ARTIFACT_CACHE_DIR: str = Field(
+        "cache/mlflow-artifacts",
+        description="Persistent model artifact cache (empty = download every start)"
+    )
+
+    ARTIFACT_CACHE_MAX_GB: float = Field(
+        10.0,
+        description="Size bound of the artifact cache (LRU eviction)"
+    )
+
+    MLFLOW_OFFLINE: bool = Field(
+        False,
+        description="Serve cached versions only, never contact the registry"
+    )
+
     # pydantic v2 style setting source (code changed in v2)
     model_config = {
         "env_file": "api/app/.env",
@@ -1,5 +1,8 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from app.routers import tabular, yolo, rag
+from app.model_loader import model_manager
+from app.config import settings
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -12,6 +15,26 @@ def create_app() -> FastAPI:
     app.include_router(rag.router)
     app.include_router(yolo.router)
 
+    @app.on_event("startup")
+    def start_model_manager():
+        # Preload blocks startup (bounded by MODEL_LOAD_TIMEOUT per model),
+        # so no request pays the MLflow download; the poller runs afterwards
+        model_manager.start(preload=settings.MODEL_PRELOAD)
+
+    @app.on_event("shutdown")
+    def stop_model_manager():
+        model_manager.stop()
+
+    @app.get("/ready")
+    def readiness():
+        status = model_manager.status()
+        return JSONResponse(content=status, status_code=200 if status["ready"] else 503)
+
+    @app.get("/models")
+    def model_status():
+        """Active version, load time, last error and timeouts per model."""
+        return model_manager.status()
+
     return app
 
 # ASGI entry point
@@ -1,8 +1,10 @@
 import mlflow
-from functools import lru_cache
-from mlflow.exceptions import MlflowException
+import numpy as np
+import pandas as pd
 
 from app.config import settings
+from app.model_manager import ModelManager, ModelNotReady
+from app.artifact_cache import ArtifactCache
 
 # =========================
 # MLflow setup (ONCE)
@@ -11,25 +13,67 @@ mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
 
 
 # =========================
-# Safe, cached model loader
+# Warm-up (before a version goes live)
 # =========================
-@lru_cache(maxsize=8)
+def warmup_tabular(model):
+    """One zero row shaped like the logged input signature, if there is one."""
+    schema = model.metadata.get_input_schema()
+    if schema is None or not schema.has_input_names():
+        return
+    model.predict(pd.DataFrame([dict.fromkeys(schema.input_names(), 0.0)]))
+
+
+def warmup_rag(model):
+    model.predict("Container damage inspection SOP warm-up.")
+
+
+def warmup_yolo(model):
+    model.predict([np.zeros((640, 640, 3), dtype=np.uint8)])
+
+
+# =========================
+# Local artifact cache (survives restarts)
+# =========================
+artifact_cache = (
+    ArtifactCache(
+        settings.ARTIFACT_CACHE_DIR,
+        max_bytes=int(settings.ARTIFACT_CACHE_MAX_GB * 1024**3),
+    )
+    if settings.ARTIFACT_CACHE_DIR
+    else None
+)
+
+
+# =========================
+# Managed models (preloaded, hot-swapped)
+# =========================
+model_manager = ModelManager(
+    [settings.TABULAR_MODEL_NAME, settings.RAG_MODEL_NAME, settings.YOLO_MODEL_NAME],
+    stage=settings.MLFLOW_MODEL_STAGE,
+    load_timeout=settings.MODEL_LOAD_TIMEOUT,
+    poll_interval=settings.MODEL_POLL_INTERVAL,
+    warmups={
+        settings.TABULAR_MODEL_NAME: warmup_tabular,
+        settings.RAG_MODEL_NAME: warmup_rag,
+        settings.YOLO_MODEL_NAME: warmup_yolo,
+    },
+    artifact_cache=artifact_cache,
+    offline=settings.MLFLOW_OFFLINE,
+)
+
+
 def load_model(model_name: str):
     """
-    Load MLflow model safely with caching.
-    
+    Active version of a managed MLflow model.
+
     Args:
         model_name (str): Registered MLflow model name.
-        
+
     Returns:
         Loaded MLflow Pyfunc model.
+
+    Raises:
+        ModelNotReady: model not loaded yet, or its load failed.
     """
-    model_uri = f"models:/{model_name}/{settings.MLFLOW_MODEL_STAGE}"
-
-    try:
-        return mlflow.pyfunc.load_model(model_uri=model_uri)
-    except MlflowException as e:
-        raise RuntimeError(
-            f"Failed to load MLflow model: {model_uri}. "
-            f"Check registry, stage, and MLflow connectivity."
-        ) from e
\ No newline at end of file
+    return model_manager.get(model_name)
+
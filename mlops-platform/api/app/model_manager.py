@@ -0,0 +1,330 @@
+"""Registry-backed model manager: preload, background polling, atomic hot swap."""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+import mlflow
+from mlflow.tracking import MlflowClient
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotReady(RuntimeError):
+    """Raised when a model has not been loaded (yet) or failed to load."""
+
+
+class ManagedModel:
+    """Active version of one registered model plus its load bookkeeping."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.model = None
+        self.version = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.status = "pending"  # pending -> loading -> ready | failed
+        self.loading_version = None
+        self.last_error = None
+        self.failed_version = None
+        self.last_poll = None
+        self.swaps = 0
+        self.timeouts = 0
+        # Load that outlived load_timeout and is still running (cannot be killed)
+        self.abandoned_load = None
+        self.abandoned_version = None
+
+    @property
+    def load_stuck(self) -> bool:
+        return self.abandoned_load is not None and not self.abandoned_load.done()
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "status": self.status,
+            "loading_version": self.loading_version,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "last_error": self.last_error,
+            "last_poll": self.last_poll,
+            "swaps": self.swaps,
+            "load_timeouts": self.timeouts,
+            "stuck_load_version": self.abandoned_version if self.load_stuck else None,
+        }
+
+
+class ModelManager:
+    """
+    Keeps one loaded instance per registered model and swaps in new
+    versions without a restart.
+
+    ``start()`` preloads every model in parallel, then a daemon thread
+    polls the registry every ``poll_interval`` seconds. When the version
+    in ``stage`` changes, the new version is loaded and warmed on the
+    poller thread (never on the request path) and only then replaces the
+    active one, a single reference assignment under a lock. Requests
+    keep being served by the old version until the swap. A load (plus
+    warm-up) that exceeds ``load_timeout`` is abandoned and reported; the
+    previous version stays active. An abandoned load keeps its own thread;
+    no new load of that model starts until it has finished, so hung loads
+    cannot pile up.
+
+    With an ``artifact_cache``, versions are loaded from local disk and
+    downloaded only once. ``offline`` never contacts the registry and
+    serves the last cached version of ``stage``; the same fallback is
+    used automatically when the registry is unreachable at startup.
+    """
+
+    def __init__(
+        self,
+        model_names,
+        stage: str = "Production",
+        load_timeout: float = 120.0,
+        poll_interval: float = 60.0,
+        warmups: dict = None,
+        artifact_cache=None,
+        offline: bool = False,
+    ):
+        self.stage = stage
+        self.artifact_cache = artifact_cache
+        self.offline = offline
+        self.load_timeout = float(load_timeout)
+        self.poll_interval = float(poll_interval)
+        # name -> callable(model), run before the model goes live
+        self.warmups = dict(warmups or {})
+
+        self._models = {name: ManagedModel(name) for name in dict.fromkeys(model_names)}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._poller = None
+
+    # =========================
+    # Public API
+    # =========================
+    def start(self, preload: bool = True):
+        if preload:
+            self.refresh_all()
+
+        if self.poll_interval > 0 and self._poller is None:
+            self._poller = threading.Thread(
+                target=self._poll_loop, name="model-registry-poller", daemon=True
+            )
+            self._poller.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def get(self, name: str):
+        """Currently active model (lock-free read of a single reference)."""
+
+        managed = self._models.get(name)
+        if managed is None:
+            raise ModelNotReady(f"Model {name!r} is not managed by this service.")
+
+        model = managed.model
+        if model is None:
+            raise ModelNotReady(
+                f"Model {name!r} is not loaded (status: {managed.status}"
+                + (f", error: {managed.last_error}" if managed.last_error else "")
+                + ")."
+            )
+        return model
+
+    @property
+    def ready(self) -> bool:
+        return all(m.model is not None for m in self._models.values())
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "stage": self.stage,
+                "ready": self.ready,
+                "poll_interval_seconds": self.poll_interval,
+                "load_timeout_seconds": self.load_timeout,
+                "offline": self.offline,
+                "models": {name: m.to_dict() for name, m in self._models.items()},
+                "artifact_cache": (
+                    self.artifact_cache.stats() if self.artifact_cache is not None else None
+                ),
+            }
+
+    def refresh_all(self):
+        """Check every model once (in parallel, so one slow load does not delay the rest)."""
+
+        threads = [
+            threading.Thread(target=self.refresh, args=(name,), daemon=True)
+            for name in self._models
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def refresh(self, name: str):
+        """Load and swap in the stage's current version if it changed."""
+
+        managed = self._models[name]
+        managed.last_poll = time.time()
+
+        try:
+            version = self._latest_version(name)
+        except Exception as e:
+            if managed.model is not None:
+                logger.warning(f"Registry poll failed for {name}: {e}")
+                return
+            version = self._cached_version(name)
+            if version is not None:
+                logger.warning(f"Cannot resolve {name} version ({e}); using cached version {version}.")
+            else:
+                # Registry lookup unavailable: still serve whatever the stage URI resolves to
+                logger.warning(f"Cannot resolve {name} version ({e}); loading by stage.")
+
+        if managed.model is not None and version in (managed.version, managed.failed_version):
+            # Unchanged, or a new version that already failed: wait for the next promotion
+            return
+
+        if managed.load_stuck:
+            logger.warning(
+                f"{name}: version {managed.abandoned_version} is still loading after its "
+                f"timeout; not starting a load of version {version}."
+            )
+            return
+
+        self._load_and_swap(managed, version)
+
+    # =========================
+    # Internals
+    # =========================
+    def _latest_version(self, name: str):
+        if self.offline:
+            version = self._cached_version(name)
+            if version is None:
+                raise LookupError(f"Offline and no cached version of {name}.")
+            return version
+
+        versions = MlflowClient().get_latest_versions(name, stages=[self.stage])
+        if not versions:
+            raise LookupError(f"No {self.stage} version registered for {name}.")
+        version = max(versions, key=lambda v: int(v.version)).version
+
+        if self.artifact_cache is not None:
+            self.artifact_cache.record_stage(name, self.stage, version)
+        return version
+
+    def _cached_version(self, name: str):
+        if self.artifact_cache is None:
+            return None
+        return self.artifact_cache.stage_version(name, self.stage)
+
+    def _active_keys(self):
+        return {f"{m.name}/{m.version}" for m in self._models.values() if m.version is not None}
+
+    def _local_path(self, name: str, version) -> str:
+        """Model dir from the artifact cache, downloading it on a miss (unless offline)."""
+
+        if self.offline:
+            path = self.artifact_cache.lookup(name, version)
+            if path is None:
+                raise LookupError(f"Offline and {name} v{version} is not cached.")
+            return path
+
+        uri = self._model_uri(name, version)
+        path, hit = self.artifact_cache.fetch(
+            name,
+            version,
+            lambda dst: mlflow.artifacts.download_artifacts(artifact_uri=uri, dst_path=dst),
+            keep=self._active_keys(),
+        )
+        logger.info(f"{name} v{version}: artifact cache {'hit' if hit else 'miss'} ({path})")
+        return path
+
+    def _model_uri(self, name: str, version) -> str:
+        # Pin the exact version so a promotion mid-load cannot mix versions
+        return f"models:/{name}/{version if version is not None else self.stage}"
+
+    def _load_and_warm(self, name: str, version):
+        if self.artifact_cache is not None and version is not None:
+            model_uri = self._local_path(name, version)
+        else:
+            model_uri = self._model_uri(name, version)
+
+        model = mlflow.pyfunc.load_model(model_uri=model_uri)
+        warmup = self.warmups.get(name)
+        if warmup is not None:
+            warmup(model)
+        return model
+
+    def _load_and_swap(self, managed: ManagedModel, version):
+        with self._lock:
+            managed.status = "loading" if managed.model is None else managed.status
+            managed.loading_version = version
+
+        started = time.perf_counter()
+        future = self._start_load(managed.name, version)
+
+        try:
+            model = future.result(timeout=self.load_timeout)
+        except FutureTimeout:
+            error = f"load of version {version} exceeded {self.load_timeout:.0f}s"
+            with self._lock:
+                managed.timeouts += 1
+                managed.abandoned_load = future
+                managed.abandoned_version = version
+                self._record_failure(managed, error)
+            logger.error(f"{managed.name}: {error}")
+            return
+        except Exception as e:
+            with self._lock:
+                self._record_failure(managed, f"version {version}: {e}")
+            logger.error(f"{managed.name}: failed to load version {version}: {e}")
+            return
+
+        with self._lock:
+            managed.model = model
+            managed.version = version
+            managed.loaded_at = time.time()
+            managed.load_seconds = round(time.perf_counter() - started, 3)
+            managed.status = "ready"
+            managed.loading_version = None
+            managed.last_error = None
+            managed.failed_version = None
+            managed.swaps += 1
+
+        logger.info(
+            f"{managed.name}: version {version} live after {managed.load_seconds}s"
+        )
+
+    def _start_load(self, name: str, version) -> Future:
+        """Load on a dedicated daemon thread, so a hung load ties up only itself."""
+
+        future = Future()
+
+        def load():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._load_and_warm(name, version))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=load, name=f"model-load-{name}", daemon=True).start()
+        return future
+
+    @staticmethod
+    def _record_failure(managed: ManagedModel, error: str):
+        managed.last_error = error
+        managed.failed_version = managed.loading_version
+        managed.loading_version = None
+        # A failed update keeps serving the previous version
+        managed.status = "ready" if managed.model is not None else "failed"
+
+    def _poll_loop(self):
+        while not self._stop_event.wait(self.poll_interval):
+            for name in self._models:
+                if self._stop_event.is_set():
+                    return
+                try:
+                    self.refresh(name)
+                except Exception as e:
+                    logger.error(f"Model poll for {name} failed: {e}")
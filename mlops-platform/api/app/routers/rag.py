@@ -3,7 +3,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from app.model_loader import load_model
+from app.model_loader import load_model, ModelNotReady
 from app.config import settings
 
 # Create a router for RAG model endpoints
@@ -25,5 +25,8 @@ def query_rag(payload: RAGRequest):
 
         return {"answer": result}
 
+    except ModelNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -4,7 +4,7 @@ from typing import Dict
 
 import pandas as pd
 
-from app.model_loader import load_model
+from app.model_loader import load_model, ModelNotReady
 from app.config import settings
 
 router = APIRouter(prefix="/tabular", tags=["tabular ML"])
@@ -33,6 +33,9 @@ def predict_tabular(payload: TabularRequest):
             "probability": round(proba, 4),
         }
 
+    except ModelNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -43,5 +46,8 @@ def health_check():
         _ = load_model(settings.TABULAR_MODEL_NAME)
         return {"status": "ok"}
 
+    except ModelNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
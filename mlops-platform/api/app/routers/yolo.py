@@ -1,41 +1,57 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from typing import List, Dict
-import tempfile
-import shutil
-import os
 
-from app.model_loader import load_model
+from app.model_loader import load_model, ModelNotReady
 from app.config import settings
 
 router = APIRouter(prefix="/detect", tags=["YOLOv8"])
 
 
+def columns_to_json(columns: Dict) -> Dict:
+    """Columnar pyfunc output (NumPy arrays) -> JSON lists, no per-box loop."""
+    return {
+        "class_id": columns["class_id"].tolist(),
+        "class_name": columns["class_name"].tolist(),
+        "confidence": columns["confidence"].round(4).tolist(),
+        "bbox": columns["xyxy"].round(2).tolist(),
+    }
+
+
+def detect_images(files: List[UploadFile]) -> List[Dict]:
+    yolo_model = load_model(settings.YOLO_MODEL_NAME)
+
+    # Encoded bytes go straight to the model as one batch (no temp files)
+    outputs = yolo_model.predict([file.file.read() for file in files])
+
+    return [
+        {
+            "filename": file.filename,
+            "containers": columns_to_json(output["containers"]),
+            "damage": columns_to_json(output["damage"]),
+        }
+        for file, output in zip(files, outputs)
+    ]
+
+
 @router.post("/yolo")
-async def detect_yolo(file: UploadFile = File(...)) -> List[Dict]:
+def detect_yolo(file: UploadFile = File(...)) -> Dict:
     try:
-        yolo_model = load_model(settings.YOLO_MODEL_NAME)
+        return detect_images([file])[0]
 
-        suffix = os.path.splitext(file.filename)[-1]
+    except ModelNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            tmp_path = tmp.name
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        results = yolo_model.predict(tmp_path)
 
-        detections = []
-        for box in results[0].boxes:
-            detections.append({
-                "class_id": int(box.cls),
-                "confidence": float(box.conf),
-                "bbox": box.xyxy[0].tolist(),
-            })
+@router.post("/yolo/batch")
+def detect_yolo_batch(files: List[UploadFile] = File(...)) -> List[Dict]:
+    try:
+        return detect_images(files)
 
-        return detections
+    except ModelNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-    finally:
-        if "tmp_path" in locals() and os.path.exists(tmp_path):
-            os.remove(tmp_path)
\ No newline at end of file
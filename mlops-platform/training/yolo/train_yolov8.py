@@ -1,11 +1,16 @@
 import mlflow
 import mlflow.pyfunc
 from ultralytics import YOLO
-import pickle
 import logging
 import os
 from pathlib import Path
 
+import cv2
+import numpy as np
+import pandas as pd
+import torch
+import torchvision
+
 from training.common.mlflow_utils import promote_latest_to_prod_alias
 
 # ====================================================
@@ -17,6 +22,9 @@ logger = logging.getLogger(__name__)
 MODEL_NAME = "container_yolov8_multi_task_model"
 EXPERIMENT_NAME = "vision-models"
 
+# CPU serving backends exported next to the .pt artifacts at logging time
+EXPORT_BACKENDS = ("onnx", "openvino")
+
 # =====================================================
 # MLflow PyFunc Model Wrapper
 # =====================================================
@@ -33,43 +41,186 @@ class YOLOv8ModelWrapper(mlflow.pyfunc.PythonModel):
         """
         logger.info("Loading YOLOv8 models from artifacts...")
 
-        self.detector = YOLO(context.artifacts["detection_model"])
-        self.damage = YOLO(context.artifacts["damage_model"])
+        # torch (default), onnx or openvino
+        backend = os.getenv("YOLO_BACKEND", "torch").lower()
+
+        self.detector = self._load_yolo(context, "detection_model", backend)
+        self.damage = self._load_yolo(context, "damage_model", backend)
+
+        # Crop cascade: damage model only on detected container crops.
+        # Read here (not at import) so serving env, not logging env, decides.
+        self.crop_cascade = os.getenv("YOLO_CROP_CASCADE", "false").lower() == "true"
+        self.crop_padding = float(os.getenv("YOLO_CROP_PADDING", "0.05"))
+        self.crop_batch_size = int(os.getenv("YOLO_CROP_BATCH_SIZE", "16"))
 
-        with open(context.artifacts["class_mapping"], "rb") as f:
-            self.class_mapping  = pickle.load(f)
+        # Images (or crops) per model call for batched input
+        self.batch_size = int(os.getenv("YOLO_BATCH_SIZE", "16"))
+
+        self.container_names = self._class_names(self.detector)
+        self.damage_names = self._class_names(self.damage)
 
         logger.info("YOLOV8 models loaded successfully.")
 
+    @staticmethod
+    def _load_yolo(context, name, backend):
+        """
+        Load one model on the requested backend.
+        Falls back to the .pt checkpoint when no export was logged.
+        """
+        exported = context.artifacts.get(f"{name}_{backend}")
+
+        if backend != "torch" and exported:
+            return YOLO(exported, task="detect")
+
+        if backend != "torch":
+            logger.warning(f"No {backend} export logged for {name}, using torch.")
+
+        return YOLO(context.artifacts[name])
+
+    @staticmethod
+    def _load_image(source):
+        """Decoded BGR image from an array, encoded bytes or a path."""
+
+        if isinstance(source, np.ndarray):
+            return source
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            image = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            image = cv2.imread(str(source))
+
+        if image is None:
+            raise ValueError("Cannot read image input (unsupported or corrupted).")
+        return image
+
+    @staticmethod
+    def _as_sources(model_input):
+        """
+        Normalize model_input to a list of images:
+        path / array / bytes, a list of those, an (N, H, W, 3) array, or a
+        DataFrame with an "image", "path" or "bytes" column (else the first).
+        """
+        if isinstance(model_input, pd.DataFrame):
+            columns = [c for c in ("image", "path", "bytes") if c in model_input.columns]
+            return model_input[columns[0] if columns else model_input.columns[0]].tolist()
+
+        if isinstance(model_input, np.ndarray) and model_input.ndim == 4:
+            return list(model_input)
+
+        if isinstance(model_input, (list, tuple)):
+            return list(model_input)
+
+        return [model_input]
+
+    @staticmethod
+    def _class_names(model):
+        """Class names as an array indexable by class id."""
+        return np.array([model.names[i] for i in sorted(model.names)])
+
+    @staticmethod
+    def _predict_arrays(model, images, batch_size):
+        """
+        (n, 6) x1, y1, x2, y2, conf, cls float32 array per image, predicted
+        batch_size images per call (one device-to-host copy per result).
+        """
+        arrays = []
+        for start in range(0, len(images), batch_size):
+            results = model(
+                source=images[start : start + batch_size],
+                conf=0.10,
+                verbose=False,
+            )
+            arrays.extend(r.boxes.data.cpu().numpy().astype(np.float32) for r in results)
+        return arrays
+
+    @staticmethod
+    def _columns(data, names):
+        """Columnar detections of one image, NumPy arrays only."""
+
+        class_ids = data[:, 5].astype(np.int32)
+        return {
+            "xyxy": np.ascontiguousarray(data[:, :4]),
+            "confidence": np.ascontiguousarray(data[:, 4]),
+            "class_id": class_ids,
+            "class_name": names[class_ids],
+        }
+
+    def _crop_windows(self, boxes, shape):
+        """Padded, clipped integer crop windows for (n, 4) container boxes."""
+
+        h, w = shape[:2]
+        pad = (boxes[:, 2:4] - boxes[:, 0:2]) * self.crop_padding
+
+        windows = np.concatenate([boxes[:, 0:2] - pad, boxes[:, 2:4] + pad], axis=1)
+        windows = np.clip(np.rint(windows), 0, [w, h, w, h]).astype(np.int64)
+
+        # Degenerate boxes (zero width/height after clipping) have nothing to crop
+        keep = (windows[:, 2] > windows[:, 0]) & (windows[:, 3] > windows[:, 1])
+        return windows[keep]
+
+    def _predict_cascade(self, images, container_data):
+        """
+        Damage model batched over the container crops only. Damage boxes are
+        shifted back to image coordinates; overlapping containers can see
+        the same damage, so a class-aware NMS removes the duplicates. No
+        container found means the damage model is not run at all.
+        """
+
+        crops, owners, offsets = [], [], []
+        for index, (image, data) in enumerate(zip(images, container_data)):
+            for x1, y1, x2, y2 in self._crop_windows(data[:, :4], image.shape):
+                crops.append(image[y1:y2, x1:x2])
+                owners.append(index)
+                offsets.append((x1, y1, x1, y1))
+
+        per_image = [[] for _ in images]
+        crop_data = self._predict_arrays(self.damage, crops, self.crop_batch_size)
+
+        for owner, offset, data in zip(owners, offsets, crop_data):
+            data[:, :4] += np.asarray(offset, dtype=np.float32)
+            per_image[owner].append(data)
+
+        damage_data = []
+        for parts in per_image:
+            data = np.concatenate(parts) if parts else np.zeros((0, 6), dtype=np.float32)
+            if len(data):
+                boxes = torch.from_numpy(data)
+                keep = torchvision.ops.batched_nms(boxes[:, :4], boxes[:, 4], boxes[:, 5], 0.5)
+                data = data[keep.numpy()]
+            damage_data.append(data)
+
+        return damage_data
+
     def predict(self, context, model_input):
         """
         model_input:
-            - image path (str / Path)
-            - numpy array
+            - image path (str / Path), numpy array or encoded image bytes
+            - list of those, or a DataFrame of paths / bytes (one batch)
 
         return:
-            dict with detection & damage results
+            one dict per input image:
+            {"containers": {...}, "damage": {...}}, each with NumPy columns
+            xyxy (n, 4), confidence (n,), class_id (n,), class_name (n,)
         """
         logger.info("Running YOLOV8 inference...")
 
-        detection_results = self.detector(
-            source=model_input,
-            conf=0.10,
-            verbose=False
-        )
+        images = [self._load_image(source) for source in self._as_sources(model_input)]
 
-        damage_results = self.damage(
-            source=model_input,
-            conf=0.10,
-            verbose=False
-        )
+        container_data = self._predict_arrays(self.detector, images, self.batch_size)
+
+        if self.crop_cascade:
+            damage_data = self._predict_cascade(images, container_data)
+        else:
+            damage_data = self._predict_arrays(self.damage, images, self.batch_size)
+
+        return [
+            {
+                "containers": self._columns(containers, self.container_names),
+                "damage": self._columns(damage, self.damage_names),
+            }
+            for containers, damage in zip(container_data, damage_data)
+        ]
 
-        return {
-            "container_detections": detection_results,
-            "damage_detections": damage_results,
-            "class_mapping": self.class_mapping
-        }
-    
 # =====================================================
 # Artifact path resolution (LOGGING ONLY)
 # =====================================================
@@ -95,18 +246,42 @@ def resolve_artifact_paths():
 # =====================================================
 # MLflow logging entrypoint
 # =====================================================
+def export_backends(name, weights_path, backends=EXPORT_BACKENDS):
+    """
+    Export one checkpoint for each CPU backend.
+    Returns artifacts keyed "<name>_<backend>".
+    """
+    artifacts = {}
+
+    for backend in backends:
+        try:
+            exported = YOLO(str(weights_path)).export(format=backend, dynamic=True)
+        except Exception as e:
+            logger.warning(f"{backend} export failed for {weights_path}: {e}")
+            continue
+
+        artifacts[f"{name}_{backend}"] = str(exported)
+        logger.info(f"Exported {name} for {backend}: {exported}")
+
+    return artifacts
+
+
 def log_model_to_mlflow():
 
     detection_path, damage_path = resolve_artifact_paths()
 
+    artifacts = {
+        "detection_model": str(detection_path),
+        "damage_model": str(damage_path),
+    }
+    artifacts.update(export_backends("detection_model", detection_path))
+    artifacts.update(export_backends("damage_model", damage_path))
+
     with mlflow.start_run():
         mlflow.pyfunc.log_model(
             artifact_path="YOLOv8_model",
             python_model=YOLOv8ModelWrapper(),
-            artifacts={
-                "detection_model": str(detection_path),
-                "damage_model": str(damage_path),
-            },
+            artifacts=artifacts,
             registered_model_name="container_yolov8_multi_task_model",
         )
 
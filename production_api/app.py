@@ -1,23 +1,60 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Match
 import uvicorn
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+import hashlib
+import gc
 import shutil
 import os
 import torch
-import cv2
 import numpy as np
 import joblib
 
-
-from ultralytics import YOLO
-
 # RAG + HuggingFace
 from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
 # Slack notifier
-from slack.thresholds import classify_alert, apply_class_weight
-from slack.notifier import send_alert
+from slack.scoring import ScoringEngine
+from slack.dispatcher import AlertDispatcher
+from slack.config import (
+    SLACK_QUEUE_PATH,
+    SLACK_RATE_PER_SEC,
+    SLACK_BURST,
+    SLACK_COALESCE_SECONDS,
+    SLACK_MAX_ATTEMPTS,
+    SLACK_DEAD_RETENTION_HOURS,
+    SLACK_MAX_DEAD,
+)
+
+# Inference scheduling
+from inference import InferencePool, MicroBatcher, Overloaded
+from inference.decode import decode_image, persist_upload, unique_upload_path
+from inference.annotate import AnnotatedImageCache, render_annotated, rebuild_result
+from inference.result_cache import InferenceResultCache
+from inference.detections import DetectionBatch
+from inference.video import VideoPipeline, probe_frame_count
+from inference.jobs import JobRunner
+from inference.mp4 import faststart
+from inference.backends import load_yolo_backend, exported_path
+from inference.tiling import TiledDetector
+from inference.cascade import ResolutionCascade
+
+# SOP retrieval
+from retrieval import CachedEmbeddings, SopRecommendationCache
+from retrieval.faiss_mmap import load_faiss_mmap
+
+# Startup orchestration
+from serving.startup import StartupOrchestrator
+from serving.memory import process_memory, model_memory_bytes, path_bytes
+from serving.metrics import MetricsRegistry, current_endpoint
+from serving.ranges import ranged_file_response
 
 # ------------------- CONFIG -------------------- #
 
@@ -25,12 +62,99 @@ MODEL_PATH = "model/best.pt"
 UPLOAD_DIR = "uploads"
 OUTPUT_DIR = "outputs"
 RAG_PATH = "rag/sop_db"
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Persistent query-embedding cache shared by all workers ("" = disabled)
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "cache/embeddings")
+
+# Multi-worker memory sharing
+# PRELOAD_MODELS: load artifacts at import (e.g. gunicorn --preload) so forked
+# workers share them copy-on-write. FAISS_MMAP: memory-map the SOP index.
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "false").lower() == "true"
+
+# YOLO serving backend: torch (.pt), onnx (ONNX Runtime) or openvino
+YOLO_BACKEND = os.getenv("YOLO_BACKEND", "torch").lower()
+YOLO_INT8 = os.getenv("YOLO_INT8", "false").lower() == "true"
+YOLO_CALIBRATION_DIR = os.getenv(
+    "YOLO_CALIBRATION_DIR", "../datasets_container/yolo_dataset/train/images"
+)
+
+# Label on every metric; defaults to a hash of MODEL_PATH
+MODEL_VERSION = os.getenv("MODEL_VERSION", "")
+FAISS_MMAP = os.getenv("FAISS_MMAP", "true").lower() == "true"
+
+# Images are decoded in memory; set to keep a copy of every upload for audit
+PERSIST_UPLOADS = os.getenv("PERSIST_UPLOADS", "false").lower() == "true"
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 CLASS_MAP = {0: "dent", 1: "rust", 2: "broken_door", 3: "leak"}
 
+# Risk / alert policy (slack/thresholds.py) as arrays in CLASS_MAP order
+scoring = ScoringEngine(CLASS_MAP.values())
+
+# Micro-batching (tune throughput vs latency)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "8"))
+MAX_BATCH_WAIT_MS = float(os.getenv("MAX_BATCH_WAIT_MS", "10"))
+MAX_QUEUE_DEPTH = int(os.getenv("MAX_QUEUE_DEPTH", "256"))
+
+# Worker pool (YOLO replicas + bounded admission)
+YOLO_REPLICAS = int(os.getenv("YOLO_REPLICAS", "1"))
+MAX_PENDING_INFERENCE = int(os.getenv("MAX_PENDING_INFERENCE", "32"))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "8"))
+OVERLOAD_STATUS_CODE = int(os.getenv("OVERLOAD_STATUS_CODE", "503"))  # 429 or 503
+
+# Video pipeline (reader → batched inference → annotate/encode)
+VIDEO_BATCH_SIZE = int(os.getenv("VIDEO_BATCH_SIZE", "8"))
+VIDEO_QUEUE_SIZE = int(os.getenv("VIDEO_QUEUE_SIZE", "32"))
+VIDEO_ANNOTATORS = int(os.getenv("VIDEO_ANNOTATORS", "2"))
+
+# Motion-gated frame skipping (unset = run the detector on every frame)
+VIDEO_MOTION_THRESHOLD = os.getenv("VIDEO_MOTION_THRESHOLD")
+VIDEO_MOTION_THRESHOLD = (
+    float(VIDEO_MOTION_THRESHOLD) if VIDEO_MOTION_THRESHOLD else None
+)
+VIDEO_MAX_FRAME_GAP = int(os.getenv("VIDEO_MAX_FRAME_GAP", "15"))
+
+# Background video jobs (each frame batch takes a replica, so images interleave)
+VIDEO_MAX_CONCURRENT_JOBS = int(os.getenv("VIDEO_MAX_CONCURRENT_JOBS", "1"))
+VIDEO_MAX_QUEUED_JOBS = int(os.getenv("VIDEO_MAX_QUEUED_JOBS", "16"))
+# Job records shared by all workers (gunicorn) and kept across restarts; empty = in-process only
+VIDEO_JOBS_DB_PATH = os.getenv("VIDEO_JOBS_DB_PATH", "cache/video_jobs.sqlite3")
+
+# SOP recommendation cache
+SOP_CACHE_SIZE = int(os.getenv("SOP_CACHE_SIZE", "1024"))
+SOP_CACHE_TTL_SECONDS = float(os.getenv("SOP_CACHE_TTL_SECONDS", "3600"))
+SOP_PREWARM_MAX_DETECTIONS = int(os.getenv("SOP_PREWARM_MAX_DETECTIONS", "0"))  # 0 = off
+
+# Annotated image output (/inspect-image-visual)
+VISUAL_JPEG_QUALITY = int(os.getenv("VISUAL_JPEG_QUALITY", "85"))
+VISUAL_MAX_SIDE = int(os.getenv("VISUAL_MAX_SIDE", "0"))  # 0 = original size
+VISUAL_CACHE_MB = float(os.getenv("VISUAL_CACHE_MB", "32"))
+
+# Tiled inference for high-resolution images (small dents / rust spots)
+YOLO_TILING = os.getenv("YOLO_TILING", "false").lower() == "true"
+YOLO_TILE_SIZE = int(os.getenv("YOLO_TILE_SIZE", "640"))
+YOLO_TILE_OVERLAP = float(os.getenv("YOLO_TILE_OVERLAP", "0.2"))
+YOLO_TILE_BATCH = int(os.getenv("YOLO_TILE_BATCH", "4"))  # tiles per model call
+YOLO_TILE_MIN_SIDE = int(os.getenv("YOLO_TILE_MIN_SIDE", "1280"))
+YOLO_TILE_MATCH_THRESHOLD = float(os.getenv("YOLO_TILE_MATCH_THRESHOLD", "0.5"))
+
+# Resolution cascade: low-res screen first, full pass only for candidates
+YOLO_CASCADE = os.getenv("YOLO_CASCADE", "false").lower() == "true"
+YOLO_CASCADE_IMGSZ = int(os.getenv("YOLO_CASCADE_IMGSZ", "320"))
+YOLO_CASCADE_SCREEN_CONF = float(os.getenv("YOLO_CASCADE_SCREEN_CONF", "0.25"))
+
+# Detection result cache keyed by decoded image (0 = disabled)
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "2048"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+# Near-duplicate tier: max differing dHash bits (unset = exact matches only)
+RESULT_CACHE_MAX_DISTANCE = os.getenv("RESULT_CACHE_MAX_DISTANCE")
+RESULT_CACHE_MAX_DISTANCE = (
+    int(RESULT_CACHE_MAX_DISTANCE) if RESULT_CACHE_MAX_DISTANCE else None
+)
+
 
 # ------------------- DEVICE AUTO DETECT -------------------- #
 
@@ -42,32 +166,344 @@ else:
     DEVICE = "cpu"
 print("Running on device:", DEVICE)
 
+# Exported backends are CPU runtimes
+YOLO_DEVICE = DEVICE if YOLO_BACKEND == "torch" else "cpu"
+
+
+# ------------------- METRICS -------------------- #
+# Prometheus text format on GET /metrics (per worker process)
+
+metrics = MetricsRegistry(const_labels={"model_version": "loading"})
+
+STAGE_SECONDS = metrics.histogram(
+    "inspection_stage_seconds",
+    "Time spent per inspection pipeline stage.",
+    ("stage", "endpoint"),
+)
+REQUEST_SECONDS = metrics.histogram(
+    "inspection_request_seconds",
+    "End-to-end request latency.",
+    ("endpoint", "status"),
+)
+SLACK_SEND_SECONDS = metrics.histogram(
+    "inspection_slack_send_seconds",
+    "Latency of one Slack webhook call from the dispatcher.",
+    ("outcome",),
+)
+
+IN_FLIGHT = defaultdict(int)
+MODEL_MEMORY = {}
+
+
+def stage(name):
+    """Time a block as ``name`` for the endpoint being served."""
+    return STAGE_SECONDS.time(stage=name, endpoint=current_endpoint.get())
+
+
+def observe_yolo_speed(results, prefix="yolo"):
+    """Per-image preprocess / inference / postprocess times reported by ultralytics."""
+
+    endpoint = current_endpoint.get()
+    for result in results:
+        speed = getattr(result, "speed", None) or {}
+        for phase in ("preprocess", "inference", "postprocess"):
+            if speed.get(phase) is not None:
+                STAGE_SECONDS.observe(
+                    speed[phase] / 1000.0, stage=f"{prefix}_{phase}", endpoint=endpoint
+                )
+
+
+# ------------------- MODEL ARTIFACTS -------------------- #
+# Bound by the startup orchestrator once every artifact is loaded and warm
+
+pool = None
+severity_model = None
+embeddings = None
+sop_db = None
+
+WARMUP_IMAGE = np.zeros((640, 640, 3), dtype=np.uint8)
+WARMUP_QUERY = "Container damage inspection SOP warm-up."
+
 
 # ------------------- LOAD YOLO MODEL -------------------- #
 
-print("Loading YOLOv8 Model...")
-model = YOLO(MODEL_PATH)
-model.to(DEVICE)
-model.fuse()  # Performance optimization
+def load_yolo():
+    """Load one YOLO replica (ultralytics predictors are not thread-safe)."""
+    return load_yolo_backend(
+        MODEL_PATH,
+        backend=YOLO_BACKEND,
+        int8=YOLO_INT8,
+        calibration_dir=YOLO_CALIBRATION_DIR,
+        device=DEVICE,
+    )
+
+
+def load_pool():
+    print(f"Loading YOLOv8 Model ({YOLO_REPLICAS} replica(s))...")
+    return InferencePool(
+        load_yolo,
+        replicas=YOLO_REPLICAS,
+        max_pending=MAX_PENDING_INFERENCE,
+        io_workers=IO_WORKERS,
+    )
+
+
+def warmup_pool(inference_pool):
+    # First predict triggers torch/ultralytics lazy init; pay it before traffic
+    for replica in inference_pool.replicas:
+        _predict_batch(replica, [WARMUP_IMAGE])
+        if cascade is not None:
+            _predict_batch(replica, [WARMUP_IMAGE], cascade.low_imgsz, cascade.screen_conf)
+
+
+def _predict_batch(replica, images, imgsz=640, conf=0.4):
+    """Run one batched YOLO predict over a list of images."""
+    return replica.predict(
+        source=images,
+        conf=conf,
+        imgsz=imgsz,
+        device=YOLO_DEVICE,
+        verbose=False,
+    )
+
+
+async def predict_batch(images):
+    return await pool.run(_predict_batch, images)
+
+
+batcher = MicroBatcher(
+    predict_batch,
+    max_batch_size=MAX_BATCH_SIZE,
+    max_wait_ms=MAX_BATCH_WAIT_MS,
+    max_queue_depth=MAX_QUEUE_DEPTH,
+    max_concurrent_batches=YOLO_REPLICAS,
+)
+
+
+def _predict_tiles(replica, tiles, imgsz):
+    results = _predict_batch(replica, tiles, imgsz)
+    observe_yolo_speed(results)
+    return results
+
+
+# Large uploads bypass the micro-batcher: one replica runs all their tiles
+tiler = (
+    TiledDetector(
+        _predict_tiles,
+        tile_size=YOLO_TILE_SIZE,
+        overlap=YOLO_TILE_OVERLAP,
+        batch_size=YOLO_TILE_BATCH,
+        min_side=YOLO_TILE_MIN_SIDE,
+        match_threshold=YOLO_TILE_MATCH_THRESHOLD,
+    )
+    if YOLO_TILING
+    else None
+)
+
+cascade = (
+    ResolutionCascade(low_imgsz=YOLO_CASCADE_IMGSZ, screen_conf=YOLO_CASCADE_SCREEN_CONF)
+    if YOLO_CASCADE
+    else None
+)
+
+
+async def predict_screen_batch(images):
+    return await pool.run(
+        _predict_batch, images, cascade.low_imgsz, cascade.screen_conf, kind="screen"
+    )
+
+
+# Low-res screening pass, batched separately from the full-resolution pass
+screen_batcher = (
+    MicroBatcher(
+        predict_screen_batch,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_wait_ms=MAX_BATCH_WAIT_MS,
+        max_queue_depth=MAX_QUEUE_DEPTH,
+        max_concurrent_batches=YOLO_REPLICAS,
+    )
+    if cascade is not None
+    else None
+)
+
+video_jobs = JobRunner(
+    max_concurrent=VIDEO_MAX_CONCURRENT_JOBS,
+    max_queued=VIDEO_MAX_QUEUED_JOBS,
+    db_path=VIDEO_JOBS_DB_PATH or None,
+)
+
+# Clip pipelines run here, off the model threads; they check out a replica per frame batch
+video_executor = ThreadPoolExecutor(
+    max_workers=max(1, VIDEO_MAX_CONCURRENT_JOBS), thread_name_prefix="video"
+)
+
+# Recently rendered annotated JPEGs, keyed by upload content hash
+annotated_cache = AnnotatedImageCache(max_bytes=int(VISUAL_CACHE_MB * 1024 * 1024))
+
+# Re-submitted (or near-identical) photos skip YOLO entirely
+result_cache = (
+    InferenceResultCache(
+        max_entries=RESULT_CACHE_SIZE,
+        ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+        max_distance=RESULT_CACHE_MAX_DISTANCE,
+        rescale=DetectionBatch.rescaled,
+    )
+    if RESULT_CACHE_SIZE > 0
+    else None
+)
+
+# Request path only enqueues; a background thread talks to Slack
+alert_dispatcher = AlertDispatcher(
+    SLACK_QUEUE_PATH,
+    rate_per_sec=SLACK_RATE_PER_SEC,
+    burst=SLACK_BURST,
+    coalesce_seconds=SLACK_COALESCE_SECONDS,
+    max_attempts=SLACK_MAX_ATTEMPTS,
+    dead_retention_seconds=SLACK_DEAD_RETENTION_HOURS * 3600,
+    max_dead=SLACK_MAX_DEAD,
+    on_send=lambda seconds, ok: SLACK_SEND_SECONDS.observe(
+        seconds, outcome="ok" if ok else "error"
+    ),
+)
 
 # ------------------- LOAD MACHINE LEARNING MODEL -------------------- #
 
-print("Loading Severity Model...")
-severity_model = joblib.load("model/severity_model.joblib")
+
+def load_severity_model():
+    print("Loading Severity Model...")
+    return joblib.load("model/severity_model.joblib")
+
+
+def warmup_severity_model(model):
+    model.predict(np.zeros((1, 3)))
+
 
 # ------------------- LOAD RAG -------------------- #
 
-print("Loading High-quality Embeddings...")
-embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
 
-print("Loading SOP RAG FAISS Database...")
-sop_db = FAISS.load_local(
-    RAG_PATH,
-    embeddings=embeddings,
-    allow_dangerous_deserialization=True,
+def load_embeddings():
+    print("Loading High-quality Embeddings...")
+    embedder = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+
+    if EMBEDDING_CACHE_DIR:
+        embedder = CachedEmbeddings(embedder, EMBEDDING_MODEL_NAME, EMBEDDING_CACHE_DIR)
+
+    return embedder
+
+
+def warmup_embeddings(embedder):
+    # Bypass the disk cache, otherwise the model itself is never exercised
+    if isinstance(embedder, CachedEmbeddings):
+        embedder = embedder.embeddings
+    embedder.embed_query(WARMUP_QUERY)
+
+
+def load_sop_db(embedder):
+    print("Loading SOP RAG FAISS Database...")
+    if FAISS_MMAP:
+        return load_faiss_mmap(RAG_PATH, embedder)
+    return FAISS.load_local(
+        RAG_PATH,
+        embeddings=embedder,
+        allow_dangerous_deserialization=True,
+    )
+
+
+# ------------------- STARTUP ORCHESTRATION -------------------- #
+
+
+def model_version():
+    """MODEL_VERSION, or a short content hash of the YOLO weights."""
+
+    if MODEL_VERSION:
+        return MODEL_VERSION
+
+    digest = hashlib.sha256()
+    with open(MODEL_PATH, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12] + yolo_backend_suffix()
+
+
+def yolo_backend_suffix():
+    if YOLO_BACKEND == "torch":
+        return ""
+    return f"-{YOLO_BACKEND}" + ("-int8" if YOLO_INT8 else "")
+
+
+def measure_model_memory(artifacts):
+    yolo = artifacts["pool"].replicas
+    embedder = artifacts["embeddings"]
+    embedder = getattr(embedder, "embeddings", embedder)  # unwrap CachedEmbeddings
+
+    return {
+        "yolo": (
+            sum(model_memory_bytes(replica.model) for replica in yolo)
+            if YOLO_BACKEND == "torch"
+            # Exported runtimes hold roughly their serialized weights
+            else len(yolo) * path_bytes(exported_path(MODEL_PATH, YOLO_BACKEND, YOLO_INT8))
+        ),
+        "severity_model": model_memory_bytes(artifacts["severity_model"]),
+        "embeddings": model_memory_bytes(
+            getattr(embedder, "client", None) or getattr(embedder, "_client", embedder)
+        ),
+        "sop_faiss": model_memory_bytes(artifacts["sop_db"].index),
+    }
+
+
+def detection_version():
+    """Fingerprint of everything cached detections depend on."""
+
+    stat = os.stat(MODEL_PATH)
+    return (
+        f"{MODEL_PATH}:{stat.st_size}:{stat.st_mtime_ns}{yolo_backend_suffix()}"
+        f"|thresholds:{scoring.version}"
+        + (f"|{tiler.version}" if tiler is not None else "")
+        + (f"|{cascade.version}" if cascade is not None else "")
+    )
+
+
+def bind_artifacts(artifacts):
+    global pool, severity_model, embeddings, sop_db
+
+    pool = artifacts["pool"]
+    severity_model = artifacts["severity_model"]
+    embeddings = artifacts["embeddings"]
+    sop_db = artifacts["sop_db"]
+
+    if result_cache is not None:
+        result_cache.set_version(detection_version())
+
+    metrics.const_labels["model_version"] = model_version()
+    try:
+        MODEL_MEMORY.update(measure_model_memory(artifacts))
+    except Exception as e:
+        print(f"[metrics] model memory estimate failed: {e!r}")
+
+    if SOP_PREWARM_MAX_DETECTIONS > 0:
+        # Runs on the startup thread, before /ready flips
+        sop_cache.prewarm(common_sop_inputs(SOP_PREWARM_MAX_DETECTIONS))
+
+    print("Setup Complete.", process_memory())
+
+
+startup = StartupOrchestrator(on_ready=bind_artifacts)
+startup.add("pool", load_pool, warmup_fn=warmup_pool)
+startup.add("severity_model", load_severity_model, warmup_fn=warmup_severity_model)
+startup.add("embeddings", load_embeddings, warmup_fn=warmup_embeddings)
+startup.add(
+    "sop_db",
+    lambda embeddings: load_sop_db(embeddings),
+    warmup_fn=lambda db: db.similarity_search(WARMUP_QUERY, k=1),
+    depends_on=("embeddings",),
 )
 
-print("Setup Complete.")
+if PRELOAD_MODELS:
+    startup.preload()
+    # Move preloaded objects out of GC tracking so collections in the
+    # workers do not touch (and un-share) their pages
+    gc.freeze()
+    print("Preloaded artifacts in parent process.", process_memory())
 
 
 # ------------------- FASTAPI SETUP -------------------- #
@@ -79,46 +515,96 @@ app = FastAPI(
 )
 
 
-# ------------------- UTILS -------------------- #
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    # Shed load early so latency stays bounded instead of queueing forever
+    return JSONResponse(
+        status_code=OVERLOAD_STATUS_CODE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
-def extract_features(result):
+# Reachable while models are still loading
+UNGATED_PATHS = {"/live", "/ready", "/health", "/metrics", "/docs", "/openapi.json"}
 
-    counts = {
-        "dent": 0,
-        "rust": 0,
-        "broken_door": 0,
-        "leak": 0,
-    }
 
-    if result.boxes is None:
-        return counts, 0
+@app.middleware("http")
+async def readiness_gate(request: Request, call_next):
+    if not startup.ready and request.url.path not in UNGATED_PATHS:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Models are still loading."},
+            headers={"Retry-After": "5"},
+        )
+    return await call_next(request)
+
+
+def route_template(request: Request) -> str:
+    """Route path (``/download-video/{video_name}``) to keep label cardinality low."""
+
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    endpoint = route_template(request)
+    current_endpoint.set(endpoint)
+
+    IN_FLIGHT[endpoint] += 1
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        IN_FLIGHT[endpoint] -= 1
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint, status=status
+        )
 
-    for cls in result.boxes.cls:
-        name = CLASS_MAP[int(cls)]
-        counts[name] += 1
 
-    severity = (
-        counts["dent"] * 1
-        + counts["rust"] * 2
-        + counts["broken_door"] * 3
-        + counts["leak"] * 4
-    )
+@app.on_event("startup")
+def start_model_loading():
+    # Loads run in background threads so /live answers immediately
+    startup.start()
+    alert_dispatcher.start()
+
+
+@app.on_event("shutdown")
+def shutdown_pool():
+    alert_dispatcher.stop()
+    video_executor.shutdown(wait=False, cancel_futures=True)
+    if pool is not None:
+        pool.shutdown()
+
+
+# ------------------- UTILS -------------------- #
+
+
+def extract_features(detections: DetectionBatch):
+    with stage("feature_extraction"):
+        return extract_features_from_counts(detections.counts(CLASS_MAP))
+
+
+def extract_features_from_counts(counts):
+
+    severity = int(scoring.severity([counts.get(name, 0) for name in scoring.class_names]))
 
     return counts, severity
 
 
 def calculate_risk_level(severity):
+    return str(scoring.risk_level(severity))
 
-    if severity >= 5:
-        return "HIGH"
-    elif severity >= 2:
-        return "MEDIUM"
-    else:
-        return "LOW"
 
-
-def get_sop_recommendation(risk, count):
+def search_sop_recommendation(risk, count):
+    """Uncached SOP lookup: MiniLM embedding + FAISS similarity search."""
 
     query = f"""
     Container damage inspection SOP.
@@ -127,56 +613,168 @@ def get_sop_recommendation(risk, count):
     What is recommendation action for provide this case?
     """
 
-    docs = sop_db.similarity_search(query, k=2)
+    with stage("rag_embedding"):
+        vector = embeddings.embed_query(query)
+
+    with stage("faiss_search"):
+        docs = sop_db.similarity_search_by_vector(vector, k=2)
+
     sop_text = "\n".join([d.page_content for d in docs])
 
     return sop_text
 
 
-# Create slack notification function
-def process_slack_alert(result, image_name, img_shape):
-    """YOLO → Feature extraction → Severity model → Threshold → Slack"""
+sop_cache = SopRecommendationCache(
+    search_sop_recommendation,
+    max_entries=SOP_CACHE_SIZE,
+    ttl_seconds=SOP_CACHE_TTL_SECONDS,
+)
+
+
+def get_sop_recommendation(risk, count):
+    with stage("sop_recommendation"):
+        return sop_cache.get(risk, count)
+
+
+def common_sop_inputs(max_detections):
+    """Every (risk, counts) combination with at most ``max_detections`` boxes."""
 
-    if result.boxes is None:
+    names = list(CLASS_MAP.values())
+    inputs = []
+
+    for combo in itertools.product(range(max_detections + 1), repeat=len(names)):
+        if sum(combo) > max_detections:
+            continue
+        counts = dict(zip(names, combo))
+        _, severity = extract_features_from_counts(counts)
+        inputs.append((calculate_risk_level(severity), counts))
+
+    return inputs
+
+
+def reload_sop_db():
+    """Reload the FAISS store from RAG_PATH and drop cached recommendations."""
+
+    global sop_db
+    sop_db = load_sop_db(embeddings)
+    sop_cache.invalidate()
+
+
+def save_upload(upload, path):
+    with open(path, "wb") as buffer:
+        shutil.copyfileobj(upload, buffer)
+
+
+def discard_upload(path):
+    # Video uploads are only needed while their job runs
+    if PERSIST_UPLOADS:
         return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
-    h, w = img_shape[:2]
-    img_area = h * w
 
-    # -----------------------------
-    # Aggregate image-level feature
-    # -----------------------------
+async def screen_image(image):
+    """
+    Low-resolution cascade pass. Returns its ``Results`` when the image has
+    no candidate damage at all (answered as clean), else None (escalate).
+    """
+
+    with stage("yolo_screen"):
+        screen = await screen_batcher.submit(image)
+    observe_yolo_speed([screen], prefix="yolo_screen")
 
-    total_boxes = len(result.boxes)
-    confidences = []
-    area_ratios = []
-    class_names = []
+    return None if cascade.needs_escalation(screen) else screen
+
+
+async def predict_image(image):
+    """
+    Tiled pass for large images; otherwise the cascade screen first when
+    enabled, then one batched 640 pass.
+    """
 
-    for box in result.boxes:
+    # A downscaled screen would miss exactly the small damage tiling is for
+    tiled = tiler is not None and tiler.applies(image.shape)
 
-        cls_id = int(box.cls[0])
-        label = CLASS_MAP[cls_id]
+    if cascade is not None and not tiled:
+        clean = await screen_image(image)
+        if clean is not None:
+            return DetectionBatch.empty(), clean
 
-        confidence = float(box.conf[0])
+    if tiled:
+        with stage("yolo_tiled"):
+            data = await pool.run(tiler, image, kind="tiled")
+        return DetectionBatch.from_data(data, image.shape), None
 
-        x1, y1, x2, y2 = box.xyxy[0]
-        box_area = float(
-            (x2 - x1) * (y2 - y1)
-        )  # Gradient calculation for bounding box area
-        bbox_area_ratio = box_area / img_area
+    with stage("yolo_total"):
+        result = await batcher.submit(image)
+    observe_yolo_speed([result])
+    return DetectionBatch.from_result(result, image.shape), result
 
-        confidences.append(confidence)
-        area_ratios.append(bbox_area_ratio)
-        class_names.append(label)
+
+async def detect_image(image, endpoint):
+    """
+    Detections for a decoded image, served from the result cache when the
+    same (or a near-identical) image was inspected recently. The raw
+    ``Results`` is only returned for fresh single-pass predictions (None on
+    a cache hit or a tiled prediction).
+    """
+
+    if result_cache is None:
+        return await predict_image(image)
+
+    with stage("result_cache_lookup"):
+        fingerprint = await pool.run_io(result_cache.fingerprint, image)
+        detections = result_cache.get(fingerprint, endpoint)
+    if detections is not None:
+        return detections, None
+
+    detections, result = await predict_image(image)
+    result_cache.put(fingerprint, detections)
+
+    return detections, result
+
+
+async def load_upload_image(file: UploadFile, data: bytes = None):
+    """Decode an uploaded image in memory (no disk round trip)."""
+
+    if data is None:
+        with stage("upload_read"):
+            data = await file.read()
+
+    with stage("decode"):
+        image = await pool.run_io(decode_image, data)
+
+    if image is None:
+        raise HTTPException(
+            status_code=400,
+            detail="OpenCV failed to read image. Possibly corrupted file.",
+        )
+
+    if PERSIST_UPLOADS:
+        await pool.run_io(persist_upload, data, UPLOAD_DIR, file.filename)
+
+    return image
+
+
+# Create slack notification function
+def process_slack_alert(
+    detections: DetectionBatch, image_name, damage_counts, sop_recommendation
+):
+    """YOLO → Feature extraction → Severity model → Threshold → Slack"""
+
+    if not len(detections):
+        return
 
     # -----------------------------
     # Build severity features
     # SAME FORMAT AS TRAINING
     # -----------------------------
 
-    avg_confidence = sum(confidences) / len(confidences)
-    total_damage_area = sum(area_ratios)
-    detection_count = total_boxes
+    avg_confidence = detections.avg_confidence
+    total_damage_area = detections.total_damage_area
+    detection_count = len(detections)
 
     # Create feature array
     features = np.array([[avg_confidence, total_damage_area, detection_count]])
@@ -191,98 +789,193 @@ def process_slack_alert(result, image_name, img_shape):
     # Class weight application
     # -----------------------------
 
-    dominant_class = max(set(class_names), key=class_names.count)
-    final_score = apply_class_weight(
-        base_score,
-        dominant_class,
-    )
+    dominant_class = detections.dominant_class(CLASS_MAP)
+    dominant_id = scoring.class_names.index(dominant_class)
 
     # -----------------------------
     # Threshold decision
     # -----------------------------
 
-    alert_level = classify_alert(final_score)
+    final_score, alert_level = scoring.alert_scores(base_score, dominant_id)
 
     # -----------------------------
-    # Slack trigger
+    # Slack trigger (queued, never waits on Slack)
     # -----------------------------
 
     if alert_level:
-        send_alert(
-            shipment_id=image_name,
-            severity_score=final_score,
-            alert_level=alert_level,
-            class_name=dominant_class,
-        )
+        with stage("slack_enqueue"):
+            alert_dispatcher.enqueue(
+                shipment_id=image_name,
+                severity_score=float(final_score),
+                alert_level=alert_level,
+                class_name=dominant_class,
+                damage_counts=damage_counts,
+                sop_recommendation=sop_recommendation,
+                image_name=image_name,
+            )
 
 
 # ------------------- VIDEO PROCESSOR -------------------- #
 
 
-def process_video(video_path, output_path):
+def score_video_alert(frame_features, dominant_ids):
+    """Worst frame through the image alert path (severity model + class weights)."""
+
+    if not frame_features:
+        return 0.0, None, None
+
+    base_scores = severity_model.predict(np.array(frame_features))
+    final_scores, alert_levels = scoring.alert_scores(base_scores, dominant_ids)
+    worst = int(np.argmax(final_scores))
+
+    return (
+        float(final_scores[worst]),
+        alert_levels[worst],
+        scoring.class_names[dominant_ids[worst]],
+    )
+
+
+def process_video(video_path, output_path, progress=None):
+
+    total = np.zeros(len(CLASS_MAP), dtype=np.int64)
+    # Severity features per frame with detections, same format as training
+    frame_features, dominant_ids = [], []
+
+    def count_frame(frame_index, result):
+        detections = DetectionBatch.from_result(result)
+        total[:] += detections.class_counts(len(CLASS_MAP))
+        if len(detections):
+            frame_features.append(
+                [detections.avg_confidence, detections.total_damage_area, len(detections)]
+            )
+            dominant_ids.append(scoring.class_names.index(detections.dominant_class(CLASS_MAP)))
+        if progress is not None:
+            progress(frame_index + 1)
+
+    def predict_frames(frames):
+        # One replica per frame batch, released between batches
+        results = pool.run_blocking(_predict_batch, frames, kind="video")
+        observe_yolo_speed(results)
+        return results
+
+    pipeline = VideoPipeline(
+        predict_frames,
+        batch_size=VIDEO_BATCH_SIZE,
+        queue_size=VIDEO_QUEUE_SIZE,
+        annotators=VIDEO_ANNOTATORS,
+        motion_threshold=VIDEO_MOTION_THRESHOLD,
+        max_frame_gap=VIDEO_MAX_FRAME_GAP,
+    )
+    frame_stats = pipeline.run(video_path, output_path, on_result=count_frame)
 
-    cap = cv2.VideoCapture(video_path)
+    total_counts = {name: int(n) for name, n in zip(scoring.class_names, total)}
+    severity = int(scoring.severity(total))
+    alert = score_video_alert(frame_features, dominant_ids)
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    return total_counts, severity, frame_stats, alert
 
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
 
-    total_counts = {
-        "dent": 0,
-        "rust": 0,
-        "broken_door": 0,
-        "leak": 0,
+# ------------------- API ENDPOINTS -------------------- #
+
+
+@app.get("/health")
+async def healthcheck():
+    return JSONResponse(content={"status": "ok"}, status_code=200)
+
+
+@app.get("/live")
+async def liveness():
+    # A failed artifact load will never recover; let the orchestrator restart us
+    if startup.failed:
+        return JSONResponse(content=startup.status(), status_code=503)
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+async def readiness():
+    status_code = 200 if startup.ready else 503
+    content = {**startup.status(), "memory": process_memory()}
+    return JSONResponse(content=content, status_code=status_code)
+
+
+@app.get("/stats/inference")
+async def inference_stats():
+    return {
+        "batcher": batcher.stats(),
+        "pool": pool.stats(),
+        "video_jobs": video_jobs.stats(),
+        "sop_cache": sop_cache.stats(),
+        "annotated_cache": annotated_cache.stats(),
+        "result_cache": result_cache.stats() if result_cache is not None else None,
+        "tiling": tiler.stats() if tiler is not None else None,
+        "cascade": cascade.stats() if cascade is not None else None,
+        "slack": alert_dispatcher.stats(),
+        "embedding_cache": (
+            embeddings.stats() if isinstance(embeddings, CachedEmbeddings) else None
+        ),
     }
 
-    frame_count = 0
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
+def queue_depths():
+    yield {"queue": "batcher"}, batcher.stats()["queue_depth"]
+    if cascade is not None:
+        yield {"queue": "screen_batcher"}, screen_batcher.stats()["queue_depth"]
+    if pool is not None:
+        pool_stats = pool.stats()
+        yield {"queue": "model_pending"}, pool_stats["pending"]
+        yield {"queue": "model_in_flight"}, pool_stats["in_flight"]
+    yield {"queue": "video_jobs"}, video_jobs.stats()["queued"]
+    yield {"queue": "slack"}, alert_dispatcher.stats()["queued"].get("pending", 0)
 
-        frame_count += 1
 
-        results = model.predict(
-            source=frame,
-            conf=0.4,
-            imgsz=640,
-            device=DEVICE,
-            verbose=False,
-        )
+def process_memory_bytes():
+    for key, value in process_memory().items():
+        if key.endswith("_mb"):
+            yield {"kind": key[: -len("_mb")]}, int(value * 1024 * 1024)
 
-        result = results[0]
 
-        annotated_frame = result.plot()
-        out.write(annotated_frame)
+metrics.gauge(
+    "inspection_in_flight_requests",
+    "Requests currently being served.",
+    lambda: (({"endpoint": e}, n) for e, n in list(IN_FLIGHT.items())),
+)
 
-        if result.boxes is not None:
-            for cls in result.boxes.cls:
-                name = CLASS_MAP[int(cls)]
-                total_counts[name] += 1
 
-    cap.release()
-    out.release()
+def cascade_outcomes():
+    if cascade is not None:
+        cascade_stats = cascade.stats()
+        yield {"outcome": "escalated"}, cascade_stats["escalated"]
+        yield {"outcome": "answered_by_screen"}, cascade_stats["answered_by_screen"]
 
-    severity = (
-        total_counts["dent"] * 1
-        + total_counts["rust"] * 2
-        + total_counts["broken_door"] * 3
-        + total_counts["leak"] * 4
-    )
 
-    return total_counts, severity, frame_count
+metrics.gauge(
+    "inspection_cascade_images_total",
+    "Images screened by the low-resolution cascade pass, by outcome.",
+    cascade_outcomes,
+    kind="counter",
+)
+metrics.gauge("inspection_queue_depth", "Items waiting per internal queue.", queue_depths)
+metrics.gauge(
+    "inspection_model_memory_bytes",
+    "Approximate memory held by each loaded model.",
+    lambda: (({"model": m}, b) for m, b in MODEL_MEMORY.items()),
+)
+metrics.gauge(
+    "inspection_process_memory_bytes",
+    "Worker RSS / PSS / shared memory.",
+    process_memory_bytes,
+)
 
 
-# ------------------- API ENDPOINTS -------------------- #
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
-@app.get("/health")
-async def healthcheck():
-    return JSONResponse(content={"status": "ok"}, status_code=200)
+@app.post("/admin/reload-sop-db")
+async def reload_sop_database():
+    await pool.run_io(reload_sop_db)
+    return {"status": "reloaded", "sop_cache": sop_cache.stats()}
 
 
 # ------------------- IMAGE JSON RESULT -------------------- #
@@ -306,43 +999,27 @@ async def inspect_image(
             detail="Invalid file type. Only image files allowed.",
         )
 
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
     # ---------- SAFE IMAGE LOAD ---------- #
 
-    image = cv2.imread(file_path)
-
-    if image is None:
-        raise HTTPException(
-            status_code=400,
-            detail="OpenCV failed to read image. Possibly corrupted file.",
-        )
+    image = await load_upload_image(file)
 
-    results = model.predict(
-        source=image,
-        conf=0.4,
-        imgsz=640,
-        device=DEVICE,
-        verbose=False,
-    )
-    result = results[0]
+    detections, result = await detect_image(image, "/inspect-image")
+    del result  # only the compact detections outlive the request
 
     # ---------- RISK ENGINE ---------- #
 
-    counts, severity = extract_features(result)
+    counts, severity = extract_features(detections)
     risk = calculate_risk_level(severity)
-    sop_recommendation = get_sop_recommendation(risk, counts)
+    sop_recommendation = await pool.run_io(get_sop_recommendation, risk, counts)
 
     # ---------- REGISTER BACKGROUND TASK FOR SLACK ALERT ---------- #
     if background_tasks:
         background_tasks.add_task(
             process_slack_alert,
-            result=result,
+            detections=detections,
             image_name=file.filename,
-            img_shape=image.shape,
+            damage_counts=counts,
+            sop_recommendation=sop_recommendation,
         )
 
     # ---------- RESPONSE ---------- #
@@ -362,79 +1039,196 @@ async def inspect_image(
 @app.post("/inspect-image-visual")
 async def inspect_image_visual(file: UploadFile = File(...)):
 
-    file_path = f"{UPLOAD_DIR}/{file.filename}"
+    with stage("upload_read"):
+        data = await file.read()
+    cache_key = hashlib.sha256(data).hexdigest()
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Repeat view: same bytes were already inspected, alerted and rendered
+    cached = annotated_cache.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="image/jpeg")
 
-    results = model.predict(
-        source=file_path,
-        conf=0.4,
-        imgsz=640,
-        device=DEVICE,
-    )
+    image = await load_upload_image(file, data)
 
-    result = results[0]  # ingesting result from results are modeled as list
-    image = cv2.imread(file_path)
+    detections, result = await detect_image(image, "/inspect-image-visual")
+    if result is None:
+        result = rebuild_result(image, detections, CLASS_MAP)
 
-    # Create slack alert
-    process_slack_alert(
-        result=result,
+    counts, severity = extract_features(detections)
+    risk = calculate_risk_level(severity)
+    sop_recommendation = await pool.run_io(get_sop_recommendation, risk, counts)
+
+    # Create slack alert (enqueue only)
+    await pool.run_io(
+        process_slack_alert,
+        detections=detections,
         image_name=file.filename,
-        img_shape=image.shape,
+        damage_counts=counts,
+        sop_recommendation=sop_recommendation,
     )
 
-    annotated_path = f"{OUTPUT_DIR}/annotated_{file.filename}"
-    result.save(filename=annotated_path)
+    # Plot + JPEG encode in memory, nothing written to OUTPUT_DIR
+    jpeg = await pool.run_io(
+        render_annotated, result, VISUAL_JPEG_QUALITY, VISUAL_MAX_SIDE
+    )
+    annotated_cache.put(cache_key, jpeg)
 
-    return FileResponse(annotated_path, media_type="image/jpeg")
+    return Response(jpeg, media_type="image/jpeg")
 
 
 # ------------------- VIDEO INSPECTION -------------------- #
 
 
-@app.post("/inspect-video")
-async def inspect_video(file: UploadFile = File(...)):
-
-    input_path = f"{UPLOAD_DIR}/{file.filename}"
-    output_path = f"{OUTPUT_DIR}/result_{file.filename}"
+async def run_video_inspection(job, input_path, filename):
+    """Video → YOLO pipeline → risk engine → SOP (runs as a background job)."""
 
-    with open(input_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    output_name = f"result_{job.id}_{os.path.basename(filename)}"
+    output_path = f"{OUTPUT_DIR}/{output_name}"
 
-    counts, severity, frames = process_video(input_path, output_path)
+    def progress(frames_done):
+        job.frames_done = frames_done
 
-    if severity >= 5:
-        send_alert(
-            image_name=file.filename,
-            label="Video Inspection Alert Summary",
-            confidence=1.0,
-            bbox_area_ratio=severity / 10,
+    try:
+        counts, severity, frame_stats, alert = await asyncio.get_running_loop().run_in_executor(
+            video_executor, process_video, input_path, output_path, progress
         )
+    finally:
+        await pool.run_io(discard_upload, input_path)
+
+    # moov atom first so players can start and seek while downloading
+    try:
+        await pool.run_io(faststart, output_path)
+    except (OSError, ValueError, OverflowError) as e:
+        print(f"[video] faststart skipped for {output_name}: {e!r}")
 
     risk = calculate_risk_level(severity)
-    sop_recommendation = get_sop_recommendation(risk, counts)
+    sop_recommendation = await pool.run_io(get_sop_recommendation, risk, counts)
+
+    final_score, alert_level, alert_class = alert
+    if alert_level:
+        await pool.run_io(
+            alert_dispatcher.enqueue,
+            shipment_id=filename,
+            severity_score=final_score,
+            alert_level=alert_level,
+            class_name=alert_class,
+            damage_counts=counts,
+            sop_recommendation=sop_recommendation,
+            image_name=f"{filename} (video, {frame_stats['frames']} frames)",
+        )
 
     return {
-        "filename": file.filename,
-        "frames_processed": frames,
+        "filename": filename,
+        "frames_processed": frame_stats["frames"],
+        "frames_inferred": frame_stats["inferred"],
+        "frames_skipped": frame_stats["skipped"],
         "damage_summary": counts,
         "severity_score": severity,
         "risk_level": risk,
         "sop_recommendation": sop_recommendation,
         "annotated_video_path": output_path,
+        "download_url": f"/download-video/{output_name}",
+    }
+
+
+async def submit_video_job(file: UploadFile):
+    input_path = unique_upload_path(UPLOAD_DIR, file.filename)
+
+    await pool.run_io(save_upload, file.file, input_path)
+    try:
+        total_frames = await pool.run_io(probe_frame_count, input_path)
+
+        return video_jobs.submit(
+            run_video_inspection,
+            input_path,
+            file.filename,
+            total_frames=total_frames,
+        )
+    except Exception:
+        # Never queued (e.g. Overloaded), so no job will clean it up
+        await pool.run_io(discard_upload, input_path)
+        raise
+
+
+def raise_job_error(job):
+    # Overloaded keeps its status code and Retry-After (see overloaded_handler)
+    if isinstance(job.exception, Overloaded):
+        raise job.exception
+    raise HTTPException(status_code=500, detail=job.error)
+
+
+@app.post("/inspect-video")
+async def inspect_video(file: UploadFile = File(...)):
+    """Blocking variant: waits for the job, same concurrency limits apply."""
+
+    job = await submit_video_job(file)
+    await job.task
+
+    if job.status == "failed":
+        raise_job_error(job)
+
+    return job.result
+
+
+@app.post("/video-jobs", status_code=202)
+async def create_video_job(file: UploadFile = File(...)):
+
+    job = await submit_video_job(file)
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/video-jobs/{job.id}",
+        "result_url": f"/video-jobs/{job.id}/result",
     }
 
 
+async def get_video_job(job_id: str):
+    # Jobs run by another worker are read from the shared job store
+    job = await pool.run_io(video_jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job id.")
+    return job
+
+
+@app.get("/video-jobs/{job_id}")
+async def video_job_status(job_id: str):
+    return (await get_video_job(job_id)).to_dict()
+
+
+@app.get("/video-jobs/{job_id}/result")
+async def video_job_result(job_id: str):
+
+    job = await get_video_job(job_id)
+
+    if job.status == "failed":
+        raise_job_error(job)
+
+    if job.status != "done":
+        return JSONResponse(
+            status_code=202,
+            content=job.to_dict(),
+            headers={"Retry-After": str(max(1, int(job.eta_seconds() or 5)))},
+        )
+
+    return job.result
+
+
 # ------------------- DOWNLOAD VIDEO -------------------- #
 
 
-@app.get("/download-video/{video_name}")
-def download_video(video_name: str):
+@app.api_route("/download-video/{video_name}", methods=["GET", "HEAD"])
+def download_video(video_name: str, request: Request):
 
+    video_name = os.path.basename(video_name)
     video_path = f"{OUTPUT_DIR}/{video_name}"
 
-    return FileResponse(
+    if not os.path.isfile(video_path):
+        raise HTTPException(status_code=404, detail="Video not found.")
+
+    # Range / 206 so dashboard players can seek and downloads can resume
+    return ranged_file_response(
+        request,
         video_path,
         media_type="video/mp4",
         filename=video_name,
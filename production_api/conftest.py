@@ -0,0 +1 @@
+# Lets tests import the app packages (inference, serving, ...) like app.py does
@@ -0,0 +1,25 @@
+"""
+Multi-worker serving with models preloaded in the master process.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+Artifacts are loaded once before the workers fork and shared with them
+copy-on-write; each worker only runs the warm-up. Per-worker RSS/PSS is
+printed at "Setup Complete." and reported by GET /ready.
+
+Video job status and results are shared through VIDEO_JOBS_DB_PATH, so
+polls may land on any worker; leave it set when running several workers.
+"""
+
+import os
+
+# Must be set before gunicorn imports app.py (preload happens at import)
+os.environ.setdefault("PRELOAD_MODELS", "true")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Warm-up and long video requests can exceed gunicorn's 30s default
+timeout = int(os.getenv("WORKER_TIMEOUT", "300"))
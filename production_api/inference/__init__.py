@@ -0,0 +1,2 @@
+from inference.executor import InferencePool, Overloaded
+from inference.batching import MicroBatcher, BatchQueueFull
@@ -0,0 +1,114 @@
+"""In-memory rendering of annotated results (no disk round trip)."""
+
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def encode_jpeg(image, quality: int = 85, max_side: int = 0) -> bytes:
+    """
+    JPEG-encode a BGR array in memory.
+
+    With ``max_side`` > 0 the image is first downscaled (aspect preserved)
+    so its longest side is at most ``max_side`` pixels.
+    """
+
+    h, w = image.shape[:2]
+    if max_side and max(h, w) > max_side:
+        scale = max_side / float(max(h, w))
+        image = cv2.resize(
+            image,
+            (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    if not ok:
+        raise ValueError("OpenCV failed to encode annotated image.")
+
+    return buffer.tobytes()
+
+
+def render_annotated(result, quality: int = 85, max_side: int = 0) -> bytes:
+    """``result.plot()`` encoded as JPEG bytes."""
+    return encode_jpeg(result.plot(), quality=quality, max_side=max_side)
+
+
+class AnnotatedImageCache:
+    """
+    Byte-bounded LRU of recently rendered annotated images.
+
+    Keys are content hashes of the upload, so a repeat view of the same
+    image is served without inference or re-encoding. Entries larger than
+    the whole budget are not stored.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+
+            self._entries[key] = data
+            self._bytes += len(data)
+
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes_used": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+def rebuild_result(image, detections, names: dict):
+    """
+    Ultralytics ``Results`` for cached detections, so they plot exactly like
+    a fresh prediction without running the model.
+    """
+
+    import torch
+    from ultralytics.engine.results import Results
+
+    data = np.column_stack(
+        [
+            detections.xyxy,
+            detections.confidences,
+            detections.class_ids.astype(np.float32),
+        ]
+    ).astype(np.float32)
+
+    return Results(image, path="", names=names, boxes=torch.from_numpy(data))
@@ -0,0 +1,413 @@
+"""
+Selectable YOLO inference backends for CPU serving.
+
+``torch`` serves the ``.pt`` checkpoint as before. ``onnx`` (ONNX Runtime)
+and ``openvino`` serve a one-time export of the same weights. Every backend
+is loaded through ``ultralytics.YOLO``, so letterboxing, NMS and the
+``Results`` objects are the same code path for all of them.
+
+With ``int8`` the export is statically quantized, calibrated on real images
+(``datasets_container/yolo_dataset`` by default): ONNX via ONNX Runtime
+QDQ quantization of the convolutions, OpenVINO via NNCF.
+
+    python -m inference.backends export --weights model/best.pt --backend onnx --int8
+    python -m inference.backends report --weights model/best.pt --backend onnx --int8 \\
+        --images ../datasets_container/yolo_dataset/train/images --output parity.json
+"""
+
+import argparse
+import fcntl
+import glob
+import json
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "openvino")
+
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png", "*.bmp")
+
+
+def exported_path(weights: str, backend: str, int8: bool = False) -> str:
+    """Where the export for ``backend`` lives, next to the ``.pt`` file."""
+
+    if backend == "torch":
+        return weights
+
+    stem, _ = os.path.splitext(weights)
+    suffix = "_int8" if int8 else ""
+
+    if backend == "onnx":
+        return f"{stem}{suffix}.onnx"
+    if backend == "openvino":
+        # ultralytics naming, so YOLO() recognizes the directory
+        return f"{stem}{suffix}_openvino_model"
+
+    raise ValueError(f"Unknown YOLO backend {backend!r}, expected one of {BACKENDS}.")
+
+
+def calibration_images(folder: str, limit: int = 300) -> list:
+    paths = []
+    for pattern in IMAGE_PATTERNS:
+        paths.extend(glob.glob(os.path.join(folder, "**", pattern), recursive=True))
+    paths = sorted(paths)[:limit]
+
+    if not paths:
+        raise FileNotFoundError(f"No calibration images found in {folder!r}.")
+    return paths
+
+
+def letterbox(image, imgsz: int = 640):
+    """Same resize + pad (114) + BGR->RGB, CHW, 0..1 as the ultralytics predictor."""
+
+    h, w = image.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    nh, nw = round(h * scale), round(w * scale)
+
+    resized = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top : top + nh, left : left + nw] = resized
+
+    return canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+
+
+# -----------------------
+# Export
+# -----------------------
+
+
+def export_weights(
+    weights: str,
+    backend: str,
+    int8: bool = False,
+    calibration_dir: str = None,
+    imgsz: int = 640,
+    calibration_limit: int = 300,
+) -> str:
+    """
+    Export ``weights`` for ``backend`` unless already done; returns the path.
+
+    Serialized with a lock file so several workers starting at once export
+    only once.
+    """
+
+    target = exported_path(weights, backend, int8)
+    if backend == "torch" or os.path.exists(target):
+        return target
+
+    with open(weights + ".export.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(target):
+                return target
+
+            print(f"Exporting {weights} -> {target} ...")
+            if backend == "onnx":
+                _export_onnx(weights, target, int8, calibration_dir, imgsz, calibration_limit)
+            else:
+                _export_openvino(weights, target, int8, calibration_dir, imgsz, calibration_limit)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    return target
+
+
+def _export_onnx(weights, target, int8, calibration_dir, imgsz, calibration_limit):
+    from ultralytics import YOLO
+
+    fp32_path = exported_path(weights, "onnx")
+    if not os.path.exists(fp32_path):
+        # dynamic: the micro-batcher and video pipeline send batches > 1
+        produced = YOLO(weights).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+        if os.path.abspath(produced) != os.path.abspath(fp32_path):
+            os.replace(produced, fp32_path)
+
+    if not int8:
+        return
+
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    images = calibration_images(_require(calibration_dir), calibration_limit)
+
+    def batches(input_name):
+        for path in images:
+            image = cv2.imread(path)
+            if image is not None:
+                yield {input_name: letterbox(image, imgsz)}
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self, input_name):
+            self._batches = batches(input_name)
+
+        def get_next(self):
+            return next(self._batches, None)
+
+    import onnxruntime
+
+    input_name = onnxruntime.InferenceSession(
+        fp32_path, providers=["CPUExecutionProvider"]
+    ).get_inputs()[0].name
+
+    tmp_path = target + ".tmp"
+    quantize_static(
+        fp32_path,
+        tmp_path,
+        _Reader(input_name),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        # Backbone/neck convolutions only: box decoding and the class
+        # sigmoid stay in float so postprocessing sees the same value range
+        op_types_to_quantize=["Conv"],
+    )
+    os.replace(tmp_path, target)
+
+
+def _export_openvino(weights, target, int8, calibration_dir, imgsz, calibration_limit):
+    from ultralytics import YOLO
+
+    model = YOLO(weights)
+    options = {"format": "openvino", "imgsz": imgsz, "dynamic": True}
+
+    if int8:
+        # NNCF calibration reads a dataset yaml; point it at the image folder
+        images = calibration_images(_require(calibration_dir), calibration_limit)
+        folder = tempfile.mkdtemp(prefix="yolo-calibration-")
+        with open(os.path.join(folder, "images.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(os.path.abspath(p) for p in images) + "\n")
+        data_yaml = os.path.join(folder, "calibration.yaml")
+        with open(data_yaml, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "path": folder,
+                    "train": "images.txt",
+                    "val": "images.txt",
+                    "names": {int(k): v for k, v in model.names.items()},
+                },
+                f,
+            )
+        options.update(int8=True, data=data_yaml)
+
+    produced = model.export(**options)
+    if os.path.abspath(produced) != os.path.abspath(target):
+        os.replace(produced, target)
+
+
+def _require(calibration_dir):
+    if not calibration_dir:
+        raise ValueError("int8 export needs a calibration image directory.")
+    return calibration_dir
+
+
+# -----------------------
+# Loading
+# -----------------------
+
+
+def load_yolo_backend(
+    weights: str,
+    backend: str = "torch",
+    int8: bool = False,
+    calibration_dir: str = None,
+    imgsz: int = 640,
+    device: str = "cpu",
+):
+    """One YOLO replica on the selected backend (exporting on first use)."""
+
+    from ultralytics import YOLO
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown YOLO backend {backend!r}, expected one of {BACKENDS}.")
+
+    if backend == "torch":
+        yolo = YOLO(weights)
+        yolo.to(device)
+        yolo.fuse()  # Performance optimization
+        return yolo
+
+    path = export_weights(weights, backend, int8, calibration_dir, imgsz)
+    return YOLO(path, task="detect")
+
+
+# -----------------------
+# Parity / latency report
+# -----------------------
+
+
+def _box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (n, 4) and (m, 4) xyxy boxes."""
+
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def compare_detections(reference: np.ndarray, candidate: np.ndarray, iou_threshold=0.5) -> dict:
+    """
+    Greedy same-class matching of two (n, 6) ``boxes.data`` arrays
+    (x1, y1, x2, y2, conf, cls), reference = torch.
+    """
+
+    matched, ious, conf_diffs = 0, [], []
+    if len(reference) and len(candidate):
+        iou = _box_iou(reference[:, :4], candidate[:, :4])
+        iou[reference[:, 5][:, None] != candidate[:, 5][None, :]] = 0.0
+
+        used = np.zeros(len(candidate), dtype=bool)
+        for i in np.argsort(-reference[:, 4]):
+            row = np.where(used, 0.0, iou[i])
+            j = int(row.argmax())
+            if row[j] >= iou_threshold:
+                used[j] = True
+                matched += 1
+                ious.append(float(row[j]))
+                conf_diffs.append(abs(float(reference[i, 4]) - float(candidate[j, 4])))
+
+    return {
+        "reference": int(len(reference)),
+        "candidate": int(len(candidate)),
+        "matched": matched,
+        "ious": ious,
+        "conf_diffs": conf_diffs,
+    }
+
+
+def _timed_predict(model, image, conf, imgsz, device, repeats):
+    result = None
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = model.predict(source=image, conf=conf, imgsz=imgsz, device=device, verbose=False)[0]
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return result.boxes.data.cpu().numpy(), min(timings)
+
+
+def _latency(ms) -> dict:
+    ms = np.asarray(ms)
+    p50, p95 = np.percentile(ms, [50, 95])
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "mean_ms": round(float(ms.mean()), 3)}
+
+
+def parity_report(
+    weights: str,
+    backend: str,
+    int8: bool,
+    images_dir: str,
+    calibration_dir: str = None,
+    limit: int = 100,
+    conf: float = 0.4,
+    imgsz: int = 640,
+    repeats: int = 3,
+) -> dict:
+    """Run torch and ``backend`` on the same images; compare boxes and latency."""
+
+    reference_model = load_yolo_backend(weights, "torch", imgsz=imgsz)
+    candidate_model = load_yolo_backend(
+        weights, backend, int8, calibration_dir or images_dir, imgsz
+    )
+
+    totals = {"reference": 0, "candidate": 0, "matched": 0}
+    ious, conf_diffs = [], []
+    exact_images = 0
+    torch_ms, backend_ms = [], []
+
+    images = calibration_images(images_dir, limit)
+    for path in images:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+
+        reference, t_ref = _timed_predict(reference_model, image, conf, imgsz, "cpu", repeats)
+        candidate, t_cand = _timed_predict(candidate_model, image, conf, imgsz, "cpu", repeats)
+        torch_ms.append(t_ref)
+        backend_ms.append(t_cand)
+
+        stats = compare_detections(reference, candidate)
+        for key in totals:
+            totals[key] += stats[key]
+        ious.extend(stats["ious"])
+        conf_diffs.extend(stats["conf_diffs"])
+        exact_images += stats["matched"] == stats["reference"] == stats["candidate"]
+
+    torch_latency = _latency(torch_ms) if torch_ms else None
+    backend_latency = _latency(backend_ms) if backend_ms else None
+
+    return {
+        "weights": weights,
+        "backend": backend,
+        "int8": int8,
+        "exported_path": exported_path(weights, backend, int8),
+        "images": len(torch_ms),
+        "conf": conf,
+        "imgsz": imgsz,
+        "parity": {
+            **totals,
+            "recall_vs_torch": round(totals["matched"] / totals["reference"], 4) if totals["reference"] else 1.0,
+            "precision_vs_torch": round(totals["matched"] / totals["candidate"], 4) if totals["candidate"] else 1.0,
+            "images_identical_detections": exact_images,
+            "mean_iou": round(float(np.mean(ious)), 4) if ious else None,
+            "max_conf_abs_diff": round(float(np.max(conf_diffs)), 4) if conf_diffs else None,
+        },
+        "latency": {
+            "torch": torch_latency,
+            backend: backend_latency,
+            "speedup_p50": (
+                round(torch_latency["p50_ms"] / backend_latency["p50_ms"], 3)
+                if torch_latency and backend_latency
+                else None
+            ),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export YOLO weights for CPU backends and check parity.")
+    parser.add_argument("command", choices=("export", "report"))
+    parser.add_argument("--weights", default="model/best.pt")
+    parser.add_argument("--backend", choices=BACKENDS[1:], default="onnx")
+    parser.add_argument("--int8", action="store_true")
+    parser.add_argument("--calibration-dir", default="../datasets_container/yolo_dataset/train/images")
+    parser.add_argument("--images", help="report: evaluation images (default: calibration dir)")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.4)
+    parser.add_argument("--output", help="report: JSON path (default: stdout)")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(export_weights(args.weights, args.backend, args.int8, args.calibration_dir, args.imgsz))
+        return
+
+    report = parity_report(
+        args.weights,
+        args.backend,
+        args.int8,
+        args.images or args.calibration_dir,
+        calibration_dir=args.calibration_dir,
+        limit=args.limit,
+        conf=args.conf,
+        imgsz=args.imgsz,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Dynamic micro-batching scheduler in front of the YOLO model."""
+
+import asyncio
+import time
+from collections import Counter
+
+from inference.executor import Overloaded
+
+
+class BatchQueueFull(Overloaded):
+    """Raised when the batching queue already holds ``max_queue_depth`` items."""
+
+
+class MicroBatcher:
+    """
+    Collect concurrent predict requests into one batched model call.
+
+    A batch is flushed as soon as it holds ``max_batch_size`` images or the
+    oldest waiting image has been queued for ``max_wait_ms``, whichever
+    comes first. Each caller gets back its own ``Results`` object. Up to
+    ``max_concurrent_batches`` batches are in flight at once, typically one
+    per model replica.
+    """
+
+    def __init__(
+        self,
+        predict_fn,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        max_queue_depth: int = 256,
+        max_concurrent_batches: int = 1,
+    ):
+        # predict_fn: async, list of images -> list of results (same order)
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.max_queue_depth = max(1, int(max_queue_depth))
+        self.max_concurrent_batches = max(1, int(max_concurrent_batches))
+
+        self._queue = None
+        self._worker = None
+        self._slots = None
+        self._dispatching = set()
+
+        # -----------------------
+        # Runtime statistics
+        # -----------------------
+        self.batches_run = 0
+        self.images_run = 0
+        self.last_batch_size = 0
+        self.batch_size_hist = Counter()
+        self.total_wait_ms = 0.0
+        self.max_wait_seen_ms = 0.0
+
+    # -----------------------
+    # Public API
+    # -----------------------
+
+    async def submit(self, image):
+        """Queue one image and wait for its own result."""
+
+        self._ensure_worker()
+
+        if self._queue.qsize() >= self.max_queue_depth:
+            raise BatchQueueFull(
+                f"Inference queue is full ({self.max_queue_depth} pending).",
+                retry_after=max(1, round(self.max_wait_ms / 1000.0)),
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((image, future, time.perf_counter()))
+
+        return await future
+
+    def stats(self) -> dict:
+        """Batch size, queue depth and wait time for throughput/latency tuning."""
+
+        avg_batch = self.images_run / self.batches_run if self.batches_run else 0.0
+        avg_wait = self.total_wait_ms / self.images_run if self.images_run else 0.0
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_depth": self.max_queue_depth,
+            "max_concurrent_batches": self.max_concurrent_batches,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches_run": self.batches_run,
+            "images_run": self.images_run,
+            "last_batch_size": self.last_batch_size,
+            "avg_batch_size": round(avg_batch, 3),
+            "batch_size_histogram": dict(sorted(self.batch_size_hist.items())),
+            "avg_queue_wait_ms": round(avg_wait, 3),
+            "max_queue_wait_ms": round(self.max_wait_seen_ms, 3),
+        }
+
+    # -----------------------
+    # Worker loop
+    # -----------------------
+
+    def _ensure_worker(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect_batch(self):
+        first = await self._queue.get()
+        batch = [first]
+
+        # Requests that piled up while every slot was busy go out together
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        deadline = first[2] + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Drop callers that gave up (client disconnect, cancellation)
+        return [item for item in batch if not item[1].done()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Wait for a free slot before collecting, so the batch keeps
+            # filling while every slot is busy
+            await self._slots.acquire()
+
+            batch = await self._collect_batch()
+            if not batch:
+                self._slots.release()
+                continue
+
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch):
+        started = time.perf_counter()
+        images = [image for image, _, _ in batch]
+
+        try:
+            results = await self.predict_fn(images)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+        self._record(batch, started)
+
+    def _record(self, batch, started):
+        size = len(batch)
+
+        self.batches_run += 1
+        self.images_run += size
+        self.last_batch_size = size
+        self.batch_size_hist[size] += 1
+
+        for _, _, queued_at in batch:
+            wait_ms = (started - queued_at) * 1000.0
+            self.total_wait_ms += wait_ms
+            self.max_wait_seen_ms = max(self.max_wait_seen_ms, wait_ms)
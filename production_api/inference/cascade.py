@@ -0,0 +1,203 @@
+"""
+Two-pass resolution cascade: a cheap low-resolution screen, escalating
+to the full pass (640 or tiled) only for images that may show damage.
+
+    python -m inference.cascade --images ../datasets_container/yolo_dataset/train/images \\
+        --low-imgsz 320 --screen-conf 0.25 --output cascade_report.json
+
+The report compares the cascade against the single-pass 640 baseline on
+the same images: escalation rate, damaged images the screen let through,
+box recall / precision and latency.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from inference.backends import (
+    BACKENDS,
+    _latency,
+    calibration_images,
+    compare_detections,
+    load_yolo_backend,
+)
+
+
+class ResolutionCascade:
+    """
+    Decides which images skip the full-resolution pass.
+
+    The screen runs at ``low_imgsz`` with ``screen_conf`` below the serving
+    threshold, so a faint or borderline box (e.g. 0.3 against ``conf=0.4``)
+    still escalates. Only images with no candidate box at all are answered
+    from the screen, as clean. Every damage class counts as a candidate.
+    """
+
+    def __init__(self, low_imgsz: int = 320, screen_conf: float = 0.25):
+        self.low_imgsz = int(low_imgsz)
+        self.screen_conf = float(screen_conf)
+
+        self._lock = threading.Lock()
+        self.screened = 0
+        self.escalated = 0
+
+    @property
+    def version(self) -> str:
+        """Settings cached detections depend on."""
+        return f"cascade:{self.low_imgsz}:{self.screen_conf}"
+
+    def needs_escalation(self, result) -> bool:
+        boxes = result.boxes
+        escalate = boxes is not None and len(boxes) > 0
+
+        with self._lock:
+            self.screened += 1
+            self.escalated += escalate
+        return escalate
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "low_imgsz": self.low_imgsz,
+                "screen_conf": self.screen_conf,
+                "screened": self.screened,
+                "escalated": self.escalated,
+                "answered_by_screen": self.screened - self.escalated,
+                "escalation_rate": (
+                    round(self.escalated / self.screened, 4) if self.screened else 0.0
+                ),
+            }
+
+
+# -----------------------
+# Offline report vs single pass
+# -----------------------
+
+
+def _predict(model, image, conf, imgsz):
+    started = time.perf_counter()
+    result = model.predict(source=image, conf=conf, imgsz=imgsz, device="cpu", verbose=False)[0]
+    return result, (time.perf_counter() - started) * 1000.0
+
+
+def _boxes(result) -> np.ndarray:
+    return result.boxes.data.cpu().numpy()
+
+
+def cascade_report(
+    weights: str,
+    images_dir: str,
+    backend: str = "torch",
+    int8: bool = False,
+    limit: int = 200,
+    conf: float = 0.4,
+    imgsz: int = 640,
+    low_imgsz: int = 320,
+    screen_conf: float = 0.25,
+) -> dict:
+    """Run baseline and cascade on the same images and compare them."""
+
+    model = load_yolo_backend(weights, backend, int8, images_dir, imgsz, device="cpu")
+    cascade = ResolutionCascade(low_imgsz, screen_conf)
+
+    # One warm-up per input size so lazy init is not billed to the first image
+    warmup = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    _predict(model, warmup, conf, imgsz)
+    _predict(model, warmup, screen_conf, low_imgsz)
+
+    totals = {"reference": 0, "candidate": 0, "matched": 0}
+    damaged, damaged_missed = 0, 0
+    baseline_ms, cascade_ms = [], []
+
+    for path in calibration_images(images_dir, limit):
+        image = cv2.imread(path)
+        if image is None:
+            continue
+
+        baseline, t_base = _predict(model, image, conf, imgsz)
+        reference = _boxes(baseline)
+
+        screen, t_screen = _predict(model, image, screen_conf, low_imgsz)
+        if cascade.needs_escalation(screen):
+            full, t_full = _predict(model, image, conf, imgsz)
+            candidate, t_cascade = _boxes(full), t_screen + t_full
+        else:
+            candidate, t_cascade = np.empty((0, 6), dtype=np.float32), t_screen
+
+        baseline_ms.append(t_base)
+        cascade_ms.append(t_cascade)
+
+        stats = compare_detections(reference, candidate)
+        for key in totals:
+            totals[key] += stats[key]
+        if len(reference):
+            damaged += 1
+            damaged_missed += not len(candidate)
+
+    baseline_latency = _latency(baseline_ms) if baseline_ms else None
+    cascade_latency = _latency(cascade_ms) if cascade_ms else None
+
+    return {
+        "weights": weights,
+        "backend": backend,
+        "int8": int8,
+        "images": len(baseline_ms),
+        "conf": conf,
+        "imgsz": imgsz,
+        "cascade": cascade.stats(),
+        "accuracy_vs_single_pass": {
+            **totals,
+            "box_recall": round(totals["matched"] / totals["reference"], 4) if totals["reference"] else 1.0,
+            "box_precision": round(totals["matched"] / totals["candidate"], 4) if totals["candidate"] else 1.0,
+            "damaged_images": damaged,
+            "damaged_images_missed": damaged_missed,
+        },
+        "latency": {
+            "single_pass": baseline_latency,
+            "cascade": cascade_latency,
+            "cpu_saved": (
+                round(1.0 - sum(cascade_ms) / sum(baseline_ms), 4) if baseline_ms else None
+            ),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the resolution cascade with single-pass YOLO.")
+    parser.add_argument("--weights", default="model/best.pt")
+    parser.add_argument("--images", default="../datasets_container/yolo_dataset/train/images")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--int8", action="store_true")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--conf", type=float, default=0.4)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--low-imgsz", type=int, default=320)
+    parser.add_argument("--screen-conf", type=float, default=0.25)
+    parser.add_argument("--output", help="JSON path (default: stdout)")
+    args = parser.parse_args()
+
+    report = cascade_report(
+        args.weights,
+        args.images,
+        backend=args.backend,
+        int8=args.int8,
+        limit=args.limit,
+        conf=args.conf,
+        imgsz=args.imgsz,
+        low_imgsz=args.low_imgsz,
+        screen_conf=args.screen_conf,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
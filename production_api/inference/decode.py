@@ -0,0 +1,41 @@
+"""Zero-disk image ingestion for uploaded files."""
+
+import os
+import uuid
+
+import cv2
+import numpy as np
+
+
+def decode_image(data: bytes):
+    """
+    Decode encoded image bytes (JPEG/PNG/...) straight into a BGR array.
+
+    Returns None when OpenCV cannot decode the payload, same as cv2.imread.
+    """
+    if not data:
+        return None
+
+    # frombuffer is zero-copy over the upload bytes
+    buffer = np.frombuffer(data, dtype=np.uint8)
+
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+
+def unique_upload_path(upload_dir: str, filename: str) -> str:
+    """Collision-free path for a client filename (also strips any directories)."""
+
+    name = os.path.basename(filename or "upload")
+
+    return os.path.join(upload_dir, f"{uuid.uuid4().hex}_{name}")
+
+
+def persist_upload(data: bytes, upload_dir: str, filename: str) -> str:
+    """Write raw upload bytes for audit; returns the stored path."""
+
+    path = unique_upload_path(upload_dir, filename)
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+    return path
@@ -0,0 +1,106 @@
+"""Compact, columnar view of one YOLO result."""
+
+import numpy as np
+
+
+class DetectionBatch:
+    """
+    NumPy-backed detections of a single image, built once per result.
+
+    Holds only class ids, confidences, xyxy boxes and box/image area
+    ratios, so it can be handed to background tasks without keeping the
+    ultralytics ``Results`` (and its original image) alive.
+    """
+
+    __slots__ = ("class_ids", "confidences", "xyxy", "area_ratios")
+
+    def __init__(self, class_ids, confidences, xyxy, area_ratios):
+        self.class_ids = class_ids
+        self.confidences = confidences
+        self.xyxy = xyxy
+        self.area_ratios = area_ratios
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.float32),
+            np.empty((0, 4), dtype=np.float32),
+            np.empty(0, dtype=np.float32),
+        )
+
+    @classmethod
+    def from_result(cls, result, img_shape=None):
+        """Vectorized conversion of ``result.boxes`` (one device→host copy)."""
+
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return cls.empty()
+
+        # boxes.data columns: x1, y1, x2, y2, conf, cls
+        data = boxes.data.cpu().numpy()
+
+        return cls.from_data(data, img_shape if img_shape is not None else result.orig_shape)
+
+    @classmethod
+    def from_data(cls, data, img_shape):
+        """From an (N, 6) x1, y1, x2, y2, conf, cls array (e.g. merged tiles)."""
+
+        if len(data) == 0:
+            return cls.empty()
+
+        xyxy = data[:, :4].astype(np.float32, copy=True)
+        confidences = data[:, 4].astype(np.float32, copy=True)
+        class_ids = data[:, 5].astype(np.int64)
+
+        h, w = img_shape[:2]
+        box_areas = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+        area_ratios = box_areas / float(h * w)
+
+        return cls(class_ids, confidences, xyxy, area_ratios)
+
+    def rescaled(self, src_shape, img_shape):
+        """Same detections mapped from an image of ``src_shape`` onto ``img_shape``."""
+
+        src_h, src_w = src_shape[:2]
+        h, w = img_shape[:2]
+        if (src_h, src_w) == (h, w) or not len(self):
+            return self
+
+        scale = np.array([w / src_w, h / src_h, w / src_w, h / src_h], dtype=np.float32)
+        xyxy = self.xyxy * scale
+        box_areas = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+        area_ratios = box_areas / float(h * w)
+
+        return type(self)(self.class_ids, self.confidences, xyxy, area_ratios)
+
+    def __len__(self):
+        return int(self.class_ids.shape[0])
+
+    # -----------------------
+    # Aggregates
+    # -----------------------
+
+    def class_counts(self, num_classes: int) -> np.ndarray:
+        return np.bincount(self.class_ids, minlength=num_classes)[:num_classes]
+
+    def counts(self, class_map: dict) -> dict:
+        """Per-class detection counts keyed by class name."""
+
+        per_class = self.class_counts(len(class_map))
+        return {name: int(per_class[cls_id]) for cls_id, name in class_map.items()}
+
+    @property
+    def avg_confidence(self) -> float:
+        return float(self.confidences.mean()) if len(self) else 0.0
+
+    @property
+    def total_damage_area(self) -> float:
+        return float(self.area_ratios.sum())
+
+    def dominant_class(self, class_map: dict):
+        """Most frequent class name (lowest class id wins ties)."""
+
+        if not len(self):
+            return None
+        return class_map[int(np.bincount(self.class_ids).argmax())]
@@ -0,0 +1,174 @@
+"""Bounded inference worker pool with admission control (backpressure)."""
+
+import asyncio
+import contextvars
+import math
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised when work is rejected because the admission queue is full."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InferencePool:
+    """
+    Fixed set of YOLO model replicas served by one thread per replica.
+
+    A single ultralytics predictor is not safe to share across threads, so
+    every model call checks out its own replica for the duration of the call.
+    At most ``replicas + max_pending`` model calls are admitted at once;
+    anything beyond that is rejected with ``Overloaded`` instead of queueing
+    without limit. Blocking non-model work (file IO, OpenCV decode, FAISS
+    search, Slack) runs on a separate IO executor so it never competes with
+    the replicas and never blocks the event loop.
+
+    Service time is averaged per call ``kind``; Retry-After is estimated
+    from ``retry_after_kind`` (the batched image calls), so one long video
+    or tiled pass does not inflate it.
+    """
+
+    def __init__(
+        self,
+        model_factory,
+        replicas: int = 1,
+        max_pending: int = 32,
+        io_workers: int = 8,
+        retry_after_kind: str = "batch",
+    ):
+        self.replicas = [model_factory() for _ in range(max(1, int(replicas)))]
+        self.max_pending = max(0, int(max_pending))
+
+        self._free = queue.SimpleQueue()
+        for replica in self.replicas:
+            self._free.put(replica)
+
+        self._model_executor = ThreadPoolExecutor(
+            max_workers=len(self.replicas), thread_name_prefix="yolo"
+        )
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=max(1, int(io_workers)), thread_name_prefix="io"
+        )
+
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._rejected = 0
+        self.retry_after_kind = retry_after_kind
+        self._avg_service_s = {}  # kind -> moving average (seconds)
+
+    # -----------------------
+    # Model work
+    # -----------------------
+
+    async def run(self, fn, *args, kind: str = "batch", **kwargs):
+        """
+        Run ``fn(replica, *args, **kwargs)`` on a free model replica.
+        ``kind`` labels the call for service-time tracking.
+        """
+
+        self._admit()
+        # Context (e.g. the endpoint label for metrics) follows the call
+        context = contextvars.copy_context()
+        future = self._submit(context.run, self._call, fn, kind, args, kwargs)
+        # A cancelled await (client gone) does not stop a running call;
+        # the slot is released when the executor is really done with it
+        return await asyncio.wrap_future(future)
+
+    def run_blocking(self, fn, *args, kind: str = "batch", **kwargs):
+        """
+        Synchronous ``run`` for threads outside the event loop (the video
+        pipeline). The replica is held for this one call only, so image
+        batches interleave with a long clip. The call counts towards
+        admission but is never rejected: the calling thread already bounds it.
+        """
+
+        with self._lock:
+            self._admitted += 1
+
+        context = contextvars.copy_context()
+        return self._submit(context.run, self._call, fn, kind, args, kwargs).result()
+
+    def _submit(self, *call):
+        """Submit an admitted call; its slot is freed once the future is done."""
+
+        try:
+            future = self._model_executor.submit(*call)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._admitted -= 1
+
+    def _admit(self):
+        with self._lock:
+            if self._admitted >= len(self.replicas) + self.max_pending:
+                self._rejected += 1
+                raise Overloaded(
+                    "Inference capacity exhausted, retry later.",
+                    retry_after=self._retry_after(),
+                )
+            self._admitted += 1
+
+    def _call(self, fn, kind, args, kwargs):
+        replica = self._free.get()
+        started = time.perf_counter()
+        try:
+            return fn(replica, *args, **kwargs)
+        finally:
+            self._free.put(replica)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                # Exponential moving average of service time per kind
+                previous = self._avg_service_s.get(kind)
+                self._avg_service_s[kind] = (
+                    elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+                )
+
+    def _retry_after(self) -> int:
+        backlog = self._admitted / len(self.replicas)
+        return max(1, math.ceil(backlog * self._avg_service_s.get(self.retry_after_kind, 0.0)))
+
+    # -----------------------
+    # Blocking non-model work
+    # -----------------------
+
+    async def run_io(self, fn, *args, **kwargs):
+        """Run a blocking, model-free call off the event loop."""
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._io_executor, lambda: context.run(fn, *args, **kwargs)
+        )
+
+    # -----------------------
+    # Introspection
+    # -----------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replicas": len(self.replicas),
+                "max_pending": self.max_pending,
+                "admitted": self._admitted,
+                "in_flight": min(self._admitted, len(self.replicas)),
+                "pending": max(0, self._admitted - len(self.replicas)),
+                "rejected_total": self._rejected,
+                "avg_service_ms": {
+                    kind: round(avg * 1000.0, 3) for kind, avg in self._avg_service_s.items()
+                },
+            }
+
+    def shutdown(self):
+        self._model_executor.shutdown(wait=False, cancel_futures=True)
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,333 @@
+"""Background job runner for long video inspections."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from inference.executor import Overloaded
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT    PRIMARY KEY,
+    owner_pid    INTEGER NOT NULL,
+    status       TEXT    NOT NULL,
+    created_at   REAL    NOT NULL,
+    started_at   REAL,
+    finished_at  REAL,
+    frames_done  INTEGER NOT NULL DEFAULT 0,
+    total_frames INTEGER NOT NULL DEFAULT 0,
+    result       TEXT,
+    error        TEXT,
+    error_type   TEXT,
+    retry_after  INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+"""
+
+
+class Job:
+    """State and progress of one background inspection."""
+
+    __slots__ = (
+        "id",
+        "status",
+        "created_at",
+        "started_at",
+        "finished_at",
+        "frames_done",
+        "total_frames",
+        "result",
+        "error",
+        "exception",
+        "task",
+    )
+
+    def __init__(self, total_frames: int = 0):
+        self.id = uuid.uuid4().hex
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.frames_done = 0
+        self.total_frames = total_frames
+        self.result = None
+        self.error = None
+        self.exception = None  # kept so callers can map e.g. Overloaded to 503
+        self.task = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def eta_seconds(self):
+        """Remaining time from the observed frame rate, None until known."""
+
+        if self.status != "running" or not self.frames_done or not self.total_frames:
+            return None
+
+        elapsed = time.time() - self.started_at
+        remaining = max(0, self.total_frames - self.frames_done)
+        return round(elapsed / self.frames_done * remaining, 1)
+
+    def to_dict(self) -> dict:
+        progress = (
+            round(self.frames_done / self.total_frames, 4)
+            if self.total_frames
+            else None
+        )
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "frames_done": self.frames_done,
+            "total_frames": self.total_frames,
+            "progress": 1.0 if self.status == "done" else progress,
+            "eta_seconds": self.eta_seconds(),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobRunner:
+    """
+    Run inspection coroutines in the background with bounded concurrency.
+
+    At most ``max_concurrent`` jobs run at once (so a batch of videos cannot
+    flood the model replicas ahead of image traffic) and at most ``max_queued``
+    wait behind them; further submissions raise ``Overloaded``. Only the
+    newest ``max_finished`` finished jobs are kept for polling.
+
+    With ``db_path``, every job is also written to a ``JobStore`` so a
+    status or result poll can be answered by any worker sharing the file,
+    and after a restart.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        max_queued: int = 16,
+        max_finished: int = 256,
+        db_path: str = None,
+        sync_interval: float = 1.0,
+    ):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queued = max(0, int(max_queued))
+        self.max_finished = max(1, int(max_finished))
+        self.sync_interval = max(0.1, float(sync_interval))
+
+        self._jobs = OrderedDict()
+        self._slots = None
+        # Optional SQLite copy of every job, readable by all workers
+        self._store = JobStore(db_path) if db_path else None
+
+    def submit(self, fn, *args, total_frames: int = 0) -> Job:
+        """Schedule ``fn(job, *args)`` (a coroutine function) and return its job."""
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+
+        queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+        if queued >= self.max_queued:
+            raise Overloaded(
+                f"Too many queued jobs ({queued}), retry later.",
+                retry_after=self._retry_after(),
+            )
+
+        job = Job(total_frames=total_frames)
+        self._jobs[job.id] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job, fn, args))
+        self._evict()
+
+        return job
+
+    def get(self, job_id: str):
+        """Local job, else (with a store) the record written by any worker.
+
+        Store reads are blocking SQLite queries; call it off the event loop.
+        """
+
+        job = self._jobs.get(job_id)
+        if job is None and self._store is not None:
+            job = self._store.load(job_id)
+        return job
+
+    def stats(self) -> dict:
+        by_status = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        for job in self._jobs.values():
+            by_status[job.status] += 1
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            **by_status,
+        }
+
+    async def _run(self, job, fn, args):
+        await self._save_async(job)
+
+        async with self._slots:
+            job.status = "running"
+            job.started_at = time.time()
+            await self._save_async(job)
+            syncing = asyncio.get_running_loop().create_task(self._sync_progress(job))
+            try:
+                job.result = await fn(job, *args)
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                job.exception = e
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                job.task = None
+                syncing.cancel()
+                await self._save_async(job)
+                if self._store is not None:
+                    await asyncio.to_thread(self._store.prune, self.max_finished)
+
+        return job.result
+
+    # -----------------------
+    # Persistence (optional)
+    # -----------------------
+
+    async def _save_async(self, job):
+        if self._store is None:
+            return
+        try:
+            await asyncio.to_thread(self._store.save, job)
+        except Exception as e:
+            print(f"[jobs] could not persist job {job.id}: {e!r}")
+
+    async def _sync_progress(self, job):
+        # Progress is only in memory; other workers see it at this interval
+        while self._store is not None:
+            await asyncio.sleep(self.sync_interval)
+            await self._save_async(job)
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def _retry_after(self) -> int:
+        durations = [
+            job.finished_at - job.started_at
+            for job in self._jobs.values()
+            if job.status == "done"
+        ]
+        if not durations:
+            return 30
+        return max(1, round(sum(durations) / len(durations)))
+
+
+class JobStore:
+    """
+    Job records in SQLite, shared by every worker on the host.
+
+    Each worker still runs its own jobs; the store only makes status and
+    results visible to whichever worker a poll lands on, and across
+    restarts. Unfinished jobs whose owning process is gone are reported
+    as failed.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived connection per call: jobs are saved from several threads
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, job):
+        exc = job.exception
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, owner_pid, status, created_at, started_at, "
+                "finished_at, frames_done, total_frames, result, error, error_type, retry_after) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    os.getpid(),
+                    job.status,
+                    job.created_at,
+                    job.started_at,
+                    job.finished_at,
+                    job.frames_done,
+                    job.total_frames,
+                    json.dumps(job.result, default=float) if job.result is not None else None,
+                    job.error,
+                    type(exc).__name__ if exc is not None else None,
+                    getattr(exc, "retry_after", None),
+                ),
+            )
+
+    def load(self, job_id: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT owner_pid, status, created_at, started_at, finished_at, frames_done, "
+                "total_frames, result, error, error_type, retry_after FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        (owner_pid, status, created_at, started_at, finished_at, frames_done,
+         total_frames, result, error, error_type, retry_after) = row
+
+        job = Job(total_frames=total_frames)
+        job.id = job_id
+        job.status = status
+        job.created_at = created_at
+        job.started_at = started_at
+        job.finished_at = finished_at
+        job.frames_done = frames_done
+        job.result = json.loads(result) if result is not None else None
+        job.error = error
+
+        if error_type == Overloaded.__name__:
+            job.exception = Overloaded(error, retry_after=retry_after or 1)
+        elif not job.finished and not _process_alive(owner_pid):
+            job.status = "failed"
+            job.error = "Worker exited before the job finished."
+
+        return job
+
+    def prune(self, keep: int):
+        """Keep only the newest ``keep`` finished jobs."""
+
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND id NOT IN "
+                "(SELECT id FROM jobs WHERE finished_at IS NOT NULL "
+                "ORDER BY finished_at DESC LIMIT ?)",
+                (keep,),
+            )
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,121 @@
+"""MP4 post-processing: move the ``moov`` atom to the front (faststart)."""
+
+import os
+import struct
+
+import numpy as np
+
+# Atoms that only contain other atoms on the path down to stco/co64
+_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+
+def _atoms(f, start, end):
+    """Yield (type, offset, header_size, size) for atoms in [start, end)."""
+
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+
+        if size == 1:
+            (size,) = struct.unpack(">Q", f.read(8))
+            header = 16
+        elif size == 0:
+            size = end - offset
+
+        if size < header:
+            raise ValueError(f"Corrupt MP4 atom {kind!r} at offset {offset}.")
+
+        yield kind, offset, header, size
+        offset += size
+
+
+def _patch_chunk_offsets(moov: bytearray, start: int, end: int, delta: int):
+    """Shift every stco/co64 chunk offset inside ``moov[start:end]`` by ``delta``."""
+
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", moov, offset)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", moov, offset + 8)
+            header = 16
+        elif size == 0:
+            size = end - offset
+
+        if kind in _CONTAINERS:
+            _patch_chunk_offsets(moov, offset + header, offset + size, delta)
+        elif kind in (b"stco", b"co64"):
+            # full box: version/flags (4), entry count (4), entries
+            body = offset + header + 8
+            (count,) = struct.unpack_from(">I", moov, offset + header + 4)
+            dtype = ">u4" if kind == b"stco" else ">u8"
+            width = 4 if kind == b"stco" else 8
+
+            entries = np.frombuffer(moov, dtype=dtype, count=count, offset=body)
+            shifted = entries.astype(np.uint64) + np.uint64(delta)
+            del entries  # release the view before writing into moov
+            if kind == b"stco" and count and int(shifted.max()) > 0xFFFFFFFF:
+                raise OverflowError("stco offsets overflow 32 bits after faststart.")
+
+            moov[body : body + count * width] = shifted.astype(dtype).tobytes()
+
+        offset += size
+
+
+def faststart(path: str) -> bool:
+    """
+    Rewrite ``path`` in place so ``moov`` precedes ``mdat`` (same as
+    ``ffmpeg -movflags +faststart``), letting players start and seek before
+    the whole file has arrived. Returns False when nothing had to change.
+    """
+
+    file_size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        atoms = list(_atoms(f, 0, file_size))
+
+        kinds = [a[0] for a in atoms]
+        if b"moov" not in kinds or b"mdat" not in kinds:
+            return False
+
+        moov_index = kinds.index(b"moov")
+        mdat_index = kinds.index(b"mdat")
+        if moov_index < mdat_index:
+            return False
+
+        _, moov_offset, _, moov_size = atoms[moov_index]
+        f.seek(moov_offset)
+        moov = bytearray(f.read(moov_size))
+
+    # Everything from the first mdat onward moves back by the moov size
+    _patch_chunk_offsets(moov, 0, len(moov), moov_size)
+
+    tmp_path = path + ".faststart"
+    try:
+        with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+            for i, (_, offset, _, size) in enumerate(atoms):
+                if i == mdat_index:
+                    dst.write(moov)
+                if i == moov_index:
+                    continue
+                src.seek(offset)
+                _copy(src, dst, size)
+
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return True
+
+
+def _copy(src, dst, length, chunk_size=1024 * 1024):
+    while length > 0:
+        data = src.read(min(chunk_size, length))
+        if not data:
+            break
+        dst.write(data)
+        length -= len(data)
+
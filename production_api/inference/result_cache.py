@@ -0,0 +1,174 @@
+"""Content-addressed inspection result cache with near-duplicate matching."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+
+import cv2
+import numpy as np
+
+# dHash: 9x8 grayscale thumbnail -> 64 horizontal gradient bits
+_DHASH_SIZE = (9, 8)
+
+Fingerprint = namedtuple("Fingerprint", ["sha256", "dhash", "generation", "shape"])
+
+
+def dhash(image) -> int:
+    """64-bit difference hash of a BGR image (robust to re-encoding/resizing)."""
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, _DHASH_SIZE, interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class InferenceResultCache:
+    """
+    LRU + TTL cache of inspection results keyed by the decoded image.
+
+    Exact tier: SHA-256 of the decoded pixels (and shape), so the same photo
+    re-uploaded with a different filename or container still hits. Near
+    tier (``max_distance`` set): the closest cached dHash within that many
+    differing bits is returned, so re-encoded or slightly resized shots of
+    the same container reuse the result. A near hit cached from an image of
+    another size goes through ``rescale(value, cached_shape, shape)`` (e.g.
+    ``DetectionBatch.rescaled``) so boxes land on the new image; without
+    ``rescale`` near hits require the same (h, w).
+
+    ``set_version()`` clears the cache whenever the model / threshold
+    fingerprint changes; results computed under an older generation are not
+    stored. Hit rates are tracked per endpoint.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 600,
+        max_distance: int = None,
+        rescale=None,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_distance = max_distance
+        self.rescale = rescale
+
+        # sha256 -> (value, expires_at, dhash, (h, w))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._version = None
+
+        self._counters = defaultdict(lambda: {"exact": 0, "near": 0, "misses": 0})
+
+    def fingerprint(self, image) -> Fingerprint:
+        """Hash the decoded image (CPU-bound, run it off the event loop)."""
+
+        digest = hashlib.sha256(str(image.shape).encode("ascii"))
+        digest.update(np.ascontiguousarray(image).data)
+
+        near = dhash(image) if self.max_distance is not None else None
+
+        with self._lock:
+            generation = self._generation
+
+        return Fingerprint(digest.hexdigest(), near, generation, tuple(image.shape[:2]))
+
+    def get(self, fp: Fingerprint, endpoint: str):
+        now = time.monotonic()
+
+        with self._lock:
+            counters = self._counters[endpoint]
+
+            entry = self._entries.get(fp.sha256)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(fp.sha256)
+                counters["exact"] += 1
+                return entry[0]
+
+            key = self._nearest(fp.dhash, fp.shape, now)
+            if key is not None:
+                self._entries.move_to_end(key)
+                counters["near"] += 1
+                value, _, _, shape = self._entries[key]
+                if shape != fp.shape:
+                    value = self.rescale(value, shape, fp.shape)
+                return value
+
+            counters["misses"] += 1
+            return None
+
+    def put(self, fp: Fingerprint, value):
+        with self._lock:
+            if fp.generation != self._generation:
+                return
+
+            self._entries[fp.sha256] = (
+                value,
+                time.monotonic() + self.ttl_seconds,
+                fp.dhash,
+                fp.shape,
+            )
+            self._entries.move_to_end(fp.sha256)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set_version(self, version: str):
+        """Record the model/threshold fingerprint; a change drops every entry."""
+
+        with self._lock:
+            changed = self._version is not None and version != self._version
+            self._version = version
+        if changed:
+            self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _nearest(self, near, shape, now):
+        """Closest live entry within ``max_distance`` bits (lock held)."""
+
+        if near is None or self.max_distance is None or not self._entries:
+            return None
+
+        keys = list(self._entries)
+        entries = self._entries.values()
+        hashes = np.fromiter((e[2] for e in entries), dtype=np.uint64, count=len(keys))
+        live = np.fromiter((e[1] > now for e in entries), dtype=bool, count=len(keys))
+        if self.rescale is None:
+            # Boxes cannot be mapped onto another size: same shape only
+            live &= np.fromiter((e[3] == shape for e in entries), dtype=bool, count=len(keys))
+
+        # Expired entries can never match (distance > 64 bits)
+        distances = np.where(live, _popcount64(hashes ^ np.uint64(near)), 65)
+
+        best = int(distances.argmin())
+        if distances[best] > self.max_distance:
+            return None
+        return keys[best]
+
+    def stats(self) -> dict:
+        with self._lock:
+            endpoints = {}
+            for endpoint, counters in self._counters.items():
+                total = sum(counters.values())
+                hits = counters["exact"] + counters["near"]
+                endpoints[endpoint] = {
+                    **counters,
+                    "hit_ratio": round(hits / total, 4) if total else 0.0,
+                }
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "max_distance": self.max_distance,
+                "version": self._version,
+                "generation": self._generation,
+                "endpoints": endpoints,
+            }
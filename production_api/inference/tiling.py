@@ -0,0 +1,186 @@
+"""Sliced (tiled) inference for high-resolution images."""
+
+import threading
+
+import numpy as np
+
+
+def tile_origins(length: int, tile: int, overlap: float) -> np.ndarray:
+    """Start offsets along one axis; the last tile is aligned to the edge."""
+
+    if length <= tile:
+        return np.zeros(1, dtype=np.int64)
+
+    stride = max(1, int(round(tile * (1.0 - overlap))))
+    origins = np.arange(0, length - tile, stride, dtype=np.int64)
+    return np.append(origins, length - tile)
+
+
+def tile_grid(height: int, width: int, tile_size: int, overlap: float) -> np.ndarray:
+    """(N, 4) x1, y1, x2, y2 windows covering the image, row-major."""
+
+    ys = tile_origins(height, tile_size, overlap)
+    xs = tile_origins(width, tile_size, overlap)
+    y0, x0 = np.meshgrid(ys, xs, indexing="ij")
+    x0, y0 = x0.ravel(), y0.ravel()
+
+    return np.stack(
+        [x0, y0, np.minimum(x0 + tile_size, width), np.minimum(y0 + tile_size, height)],
+        axis=1,
+    )
+
+
+def merge_detections(data: np.ndarray, match_threshold: float = 0.5) -> np.ndarray:
+    """
+    Greedy class-aware merge of overlapping boxes (x1, y1, x2, y2, conf, cls).
+
+    Boxes are visited by descending confidence. Every remaining box of the
+    same class whose intersection over the *smaller* box exceeds
+    ``match_threshold`` is folded into the current one: the kept box becomes
+    their union and keeps the highest confidence. Intersection-over-smaller
+    (rather than IoU) is what joins the halves of a dent cut by a tile
+    border, and a tile box with the same damage from the full-image pass.
+    """
+
+    if len(data) <= 1:
+        return data
+
+    data = data[np.argsort(-data[:, 4], kind="stable")]
+    areas = (data[:, 2] - data[:, 0]) * (data[:, 3] - data[:, 1])
+    alive = np.ones(len(data), dtype=bool)
+    merged = []
+
+    for i in range(len(data)):
+        if not alive[i]:
+            continue
+
+        rest = np.flatnonzero(alive)
+        rest = rest[(rest > i) & (data[rest, 5] == data[i, 5])]
+
+        box = data[i].copy()
+        if rest.size:
+            iw = np.minimum(data[rest, 2], box[2]) - np.maximum(data[rest, 0], box[0])
+            ih = np.minimum(data[rest, 3], box[3]) - np.maximum(data[rest, 1], box[1])
+            inter = np.clip(iw, 0, None) * np.clip(ih, 0, None)
+            smaller = np.maximum(np.minimum(areas[rest], areas[i]), 1e-9)
+            matched = rest[inter / smaller > match_threshold]
+
+            if matched.size:
+                alive[matched] = False
+                box[0:2] = np.minimum(box[0:2], data[matched, 0:2].min(axis=0))
+                box[2:4] = np.maximum(box[2:4], data[matched, 2:4].max(axis=0))
+
+        merged.append(box)
+
+    return np.stack(merged)
+
+
+class TiledDetector:
+    """
+    Detect small damage on large images by running the model on
+    overlapping native-resolution tiles.
+
+    Tiles are numpy views into the decoded image and go through the model
+    ``batch_size`` at a time; each chunk is reduced to a small (N, 6) array
+    before the next one starts, so peak memory is one chunk of tiles plus
+    the image itself, whatever its resolution. A downscaled full-image
+    pass (``full_image``) keeps large damage that no single tile contains.
+    Boxes are shifted back to image coordinates and merged across tiles
+    with ``merge_detections``.
+    """
+
+    def __init__(
+        self,
+        predict_fn,
+        tile_size: int = 640,
+        overlap: float = 0.2,
+        batch_size: int = 4,
+        min_side: int = 1280,
+        match_threshold: float = 0.5,
+        full_image: bool = True,
+    ):
+        # predict_fn(replica, images, imgsz) -> list of ultralytics Results
+        self.predict_fn = predict_fn
+        self.tile_size = max(32, int(tile_size))
+        self.overlap = min(max(float(overlap), 0.0), 0.9)
+        self.batch_size = max(1, int(batch_size))
+        self.min_side = int(min_side)
+        self.match_threshold = float(match_threshold)
+        self.full_image = full_image
+
+        # -----------------------
+        # Runtime statistics
+        # -----------------------
+        self._lock = threading.Lock()
+        self.images_tiled = 0
+        self.tiles_run = 0
+        self.boxes_before_merge = 0
+        self.boxes_after_merge = 0
+
+    @property
+    def version(self) -> str:
+        """Settings cached detections depend on."""
+        return (
+            f"tiled:{self.tile_size}:{self.overlap}:{self.min_side}"
+            f":{self.match_threshold}:{int(self.full_image)}"
+        )
+
+    def applies(self, shape) -> bool:
+        """Only images whose longer side reaches ``min_side`` are tiled."""
+        return max(shape[:2]) >= max(self.min_side, self.tile_size + 1)
+
+    def __call__(self, replica, image) -> np.ndarray:
+        """(N, 6) x1, y1, x2, y2, conf, cls in image coordinates."""
+
+        h, w = image.shape[:2]
+        windows = tile_grid(h, w, self.tile_size, self.overlap)
+        parts = []
+
+        if self.full_image:
+            parts.append(self._boxes(self.predict_fn(replica, [image], self.tile_size)[0]))
+
+        for start in range(0, len(windows), self.batch_size):
+            chunk = windows[start : start + self.batch_size]
+            tiles = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in chunk]
+            results = self.predict_fn(replica, tiles, self.tile_size)
+
+            for (x1, y1, _, _), result in zip(chunk, results):
+                boxes = self._boxes(result)
+                boxes[:, [0, 2]] += x1
+                boxes[:, [1, 3]] += y1
+                parts.append(boxes)
+            del tiles, results
+
+        data = np.concatenate(parts) if parts else np.empty((0, 6), dtype=np.float32)
+        merged = merge_detections(data, self.match_threshold)
+
+        with self._lock:
+            self.images_tiled += 1
+            self.tiles_run += len(windows)
+            self.boxes_before_merge += len(data)
+            self.boxes_after_merge += len(merged)
+
+        return merged
+
+    @staticmethod
+    def _boxes(result) -> np.ndarray:
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return np.empty((0, 6), dtype=np.float32)
+        # x1, y1, x2, y2, conf, cls; copy so the tile Results can be freed
+        return boxes.data.cpu().numpy().astype(np.float32, copy=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            avg_tiles = self.tiles_run / self.images_tiled if self.images_tiled else 0.0
+            return {
+                "tile_size": self.tile_size,
+                "overlap": self.overlap,
+                "batch_size": self.batch_size,
+                "min_side": self.min_side,
+                "images_tiled": self.images_tiled,
+                "tiles_run": self.tiles_run,
+                "avg_tiles_per_image": round(avg_tiles, 2),
+                "boxes_before_merge": self.boxes_before_merge,
+                "boxes_after_merge": self.boxes_after_merge,
+            }
@@ -0,0 +1,271 @@
+"""Pipelined decode / infer / annotate+encode video processor."""
+
+import copy
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+_END = object()
+
+# Motion score is computed on a tiny grayscale thumbnail
+_MOTION_SIZE = (64, 36)
+
+
+class VideoPipeline:
+    """
+    Three-stage video engine joined by bounded queues.
+
+    - reader thread: ``cv2.VideoCapture`` decode
+    - calling thread: batched inference; ``predict_fn`` borrows a model
+      replica per batch (e.g. ``InferencePool.run_blocking``)
+    - writer thread: ``result.plot()`` on a small annotator pool, then
+      ``cv2.VideoWriter`` encode
+
+    Every stage is FIFO and the writer drains annotations in submission
+    order, so the output video is frame-ordered. Bounded queues keep
+    memory flat no matter how long the clip is.
+
+    With ``motion_threshold`` set, the reader scores each frame against the
+    last inferred frame (mean absolute difference of a downscaled grayscale
+    image, 0..1) and only frames above the threshold, or ``max_frame_gap``
+    frames after the last inference, go to the detector. Skipped frames are
+    annotated with the last detections.
+    """
+
+    def __init__(
+        self,
+        predict_fn,
+        batch_size: int = 8,
+        queue_size: int = 32,
+        annotators: int = 2,
+        motion_threshold: float = None,
+        max_frame_gap: int = 15,
+    ):
+        # predict_fn: list of frames -> list of results (same order)
+        self.predict_fn = predict_fn
+        self.batch_size = max(1, int(batch_size))
+        self.queue_size = max(self.batch_size, int(queue_size))
+        self.annotators = max(1, int(annotators))
+        self.motion_threshold = motion_threshold
+        self.max_frame_gap = max(1, int(max_frame_gap))
+
+    def run(self, video_path, output_path, on_result=None) -> dict:
+        """
+        Process ``video_path`` into ``output_path``.
+
+        ``on_result(frame_index, result)`` is called from the inference stage
+        for every frame, in order (skipped frames get the reused result).
+        Returns frame totals: ``frames``, ``inferred`` and ``skipped``.
+        """
+
+        cap = cv2.VideoCapture(video_path)
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+
+        frames_q = queue.Queue(maxsize=self.queue_size)
+        results_q = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+
+        reader = threading.Thread(
+            target=self._guard,
+            args=(self._read, errors, stop, cap, frames_q, stop),
+            name="video-reader",
+            daemon=True,
+        )
+        writer = threading.Thread(
+            target=self._guard,
+            args=(self._write, errors, stop, out, results_q, stop),
+            name="video-writer",
+            daemon=True,
+        )
+
+        reader.start()
+        writer.start()
+
+        totals = {"frames": 0, "inferred": 0, "skipped": 0}
+        try:
+            self._infer(frames_q, results_q, stop, on_result, totals)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            _put(results_q, _END, stop)
+            reader.join()
+            writer.join()
+            cap.release()
+            out.release()
+
+        if errors:
+            raise errors[0]
+
+        return totals
+
+    # -----------------------
+    # Stages
+    # -----------------------
+
+    @staticmethod
+    def _guard(stage, errors, stop, *args):
+        try:
+            stage(*args)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    def _read(self, cap, frames_q, stop):
+        key_thumb = None
+        since_key = 0
+
+        while not stop.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            infer = True
+            if self.motion_threshold is not None:
+                thumb = _thumbnail(frame)
+                infer = (
+                    key_thumb is None
+                    or since_key >= self.max_frame_gap
+                    or _motion_score(thumb, key_thumb) >= self.motion_threshold
+                )
+                if infer:
+                    key_thumb, since_key = thumb, 0
+                since_key += 1
+
+            if not _put(frames_q, (frame, infer), stop):
+                return
+        _put(frames_q, _END, stop)
+
+    def _infer(self, frames_q, results_q, stop, on_result, totals):
+        last_result = None
+        finished = False
+
+        while not finished and not stop.is_set():
+            # Window of frames holding up to batch_size frames to infer;
+            # skipped frames ride along so ordering is preserved
+            window = []
+            to_infer = 0
+            while to_infer < self.batch_size and len(window) < self.queue_size:
+                item = _get(frames_q, stop)
+                if item is _END or item is None:
+                    finished = True
+                    break
+                window.append(item)
+                to_infer += item[1]
+
+            if not window:
+                break
+
+            # One predict call for the whole batch of frames
+            batch = [frame for frame, infer in window if infer]
+            results = iter(self.predict_fn(batch) if batch else ())
+
+            for frame, infer in window:
+                if infer:
+                    last_result = next(results)
+                    result = last_result
+                    totals["inferred"] += 1
+                else:
+                    result = _reuse(last_result, frame)
+                    totals["skipped"] += 1
+
+                if on_result is not None:
+                    on_result(totals["frames"], result)
+                totals["frames"] += 1
+
+                if not _put(results_q, result, stop):
+                    return
+
+    def _write(self, out, results_q, stop):
+        pending = deque()
+
+        with ThreadPoolExecutor(
+            max_workers=self.annotators, thread_name_prefix="video-annotate"
+        ) as annotate:
+            while True:
+                result = _get(results_q, stop)
+                if result is _END or result is None:
+                    break
+
+                pending.append(annotate.submit(result.plot))
+
+                # Write completed frames in order; bound the in-flight window
+                while pending and (
+                    pending[0].done() or len(pending) > self.annotators * 2
+                ):
+                    out.write(pending.popleft().result())
+
+            while pending and not stop.is_set():
+                out.write(pending.popleft().result())
+
+
+# -----------------------
+# Motion gating helpers
+# -----------------------
+
+
+def _thumbnail(frame):
+    small = cv2.resize(frame, _MOTION_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+
+def _motion_score(thumb, key_thumb) -> float:
+    """Mean absolute pixel change in 0..1."""
+    return float(cv2.absdiff(thumb, key_thumb).mean()) / 255.0
+
+
+def _reuse(result, frame):
+    """Last detections drawn onto a skipped frame (shallow copy, no boxes copy)."""
+    reused = copy.copy(result)
+    reused.orig_img = frame
+    return reused
+
+
+# -----------------------
+# Stop-aware queue helpers
+# -----------------------
+
+
+def _put(q, item, stop, poll=0.1) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=poll)
+            return True
+        except queue.Full:
+            continue
+    # The end marker must still reach a consumer that is draining
+    if item is _END:
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(q, stop, poll=0.1):
+    while True:
+        try:
+            return q.get(timeout=poll)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+def probe_frame_count(video_path) -> int:
+    """Container-reported frame count (0 when unknown)."""
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        cap.release()
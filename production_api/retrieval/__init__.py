@@ -0,0 +1,2 @@
+from retrieval.embedding_cache import CachedEmbeddings
+from retrieval.sop_cache import SopRecommendationCache
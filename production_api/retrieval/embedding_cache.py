@@ -0,0 +1,196 @@
+"""Persistent, memory-mapped query-embedding cache shared across workers."""
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Disk-backed cache in front of a LangChain embeddings object.
+
+    Layout of ``cache_dir``:
+
+    - ``meta.json``   model name and vector dimension
+    - ``vectors.f32`` float32 rows, opened read-only with ``np.memmap`` so
+      every uvicorn worker shares the same page cache
+    - ``keys.txt``    append-only ``<sha256(model, text)> <row>`` index
+
+    Appends are serialized across processes with ``flock``; a key line is
+    only written after its row, so readers never see a key without data.
+    """
+
+    def __init__(self, embeddings, model_name: str, cache_dir: str):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._vectors_path = os.path.join(cache_dir, "vectors.f32")
+        self._keys_path = os.path.join(cache_dir, "keys.txt")
+        self._lock_path = os.path.join(cache_dir, "lock")
+        self._meta_path = os.path.join(cache_dir, "meta.json")
+
+        self._lock = threading.Lock()
+        self._index = {}
+        self._keys_offset = 0
+        self._vectors = None
+        self._dim = self._read_dim()
+
+        self.hits = 0
+        self.misses = 0
+
+    # -----------------------
+    # LangChain Embeddings API
+    # -----------------------
+
+    def embed_query(self, text: str):
+        key = self._key(text)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        vector = self.embeddings.embed_query(text)
+        self._store([(key, vector)])
+        return vector
+
+    def embed_documents(self, texts):
+        keys = [self._key(text) for text in texts]
+        vectors = [self._lookup(key) for key in keys]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            computed = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+            self._store([(keys[i], vectors[i]) for i in missing])
+
+        return vectors
+
+    # -----------------------
+    # Cache internals
+    # -----------------------
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key):
+        with self._lock:
+            row = self._index.get(key)
+            if row is None:
+                self._refresh()
+                row = self._index.get(key)
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return self._vectors[row].tolist()
+
+    def _refresh(self):
+        """Pick up keys appended by this or other workers since the last read."""
+
+        if not os.path.exists(self._keys_path):
+            return
+
+        if os.path.getsize(self._keys_path) == self._keys_offset:
+            return
+
+        with open(self._keys_path, "r", encoding="ascii") as f:
+            f.seek(self._keys_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written line, read again next time
+                key, row = line.split()
+                self._index[key] = int(row)
+                self._keys_offset += len(line)
+
+        if self._dim is None:
+            self._dim = self._read_dim()
+
+        rows = os.path.getsize(self._vectors_path) // (4 * self._dim)
+        if self._vectors is None or self._vectors.shape[0] < rows:
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim)
+            )
+
+    def _store(self, items):
+        if not items:
+            return
+
+        data = np.asarray([vector for _, vector in items], dtype=np.float32)
+
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self._dim is None:
+                    self._dim = self._read_dim()
+                if self._dim is None:
+                    self._init_meta(data.shape[1])
+
+                row_bytes = 4 * self._dim
+                fd = os.open(self._vectors_path, os.O_RDWR | os.O_CREAT, 0o644)
+                with os.fdopen(fd, "r+b") as f:
+                    # Start on a row boundary even after an interrupted write
+                    first_row = f.seek(0, os.SEEK_END) // row_bytes
+                    f.truncate(first_row * row_bytes)
+                    f.seek(first_row * row_bytes)
+                    f.write(data.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                with open(self._keys_path, "a", encoding="ascii") as f:
+                    for i, (key, _) in enumerate(items):
+                        f.write(f"{key} {first_row + i}\n")
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+            self._refresh()
+
+    def _read_dim(self):
+        if not os.path.exists(self._meta_path):
+            return None
+
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("model_name") != self.model_name:
+            raise ValueError(
+                f"Embedding cache at {self.cache_dir} belongs to "
+                f"{meta.get('model_name')!r}, not {self.model_name!r}."
+            )
+
+        return int(meta["dim"])
+
+    def _init_meta(self, dim):
+        self._dim = int(dim)
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump({"model_name": self.model_name, "dim": self._dim}, f)
+
+    # -----------------------
+    # Introspection
+    # -----------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            bytes_used = sum(
+                os.path.getsize(path)
+                for path in (self._vectors_path, self._keys_path, self._meta_path)
+                if os.path.exists(path)
+            )
+            return {
+                "cache_dir": self.cache_dir,
+                "entries": len(self._index),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "bytes_used": bytes_used,
+            }
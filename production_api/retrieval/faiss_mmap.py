@@ -0,0 +1,47 @@
+"""Open a LangChain FAISS store with the index memory-mapped instead of copied."""
+
+import os
+import pickle
+
+import faiss
+from langchain_community.vectorstores import FAISS
+
+
+def _read_index_mmap(index_path: str):
+    """
+    Memory-map the FAISS index when the installed faiss supports it.
+
+    Flat indexes need ``IO_FLAG_MMAP_IFC`` (newer faiss), IVF indexes accept
+    ``IO_FLAG_MMAP``. Falls back to a regular in-heap read.
+    """
+    flag_sets = []
+    if hasattr(faiss, "IO_FLAG_MMAP_IFC"):
+        flag_sets.append(faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+    flag_sets.append(faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+
+    for flags in flag_sets:
+        try:
+            return faiss.read_index(index_path, flags), True
+        except RuntimeError:
+            continue
+
+    return faiss.read_index(index_path), False
+
+
+def load_faiss_mmap(folder_path: str, embeddings, index_name: str = "index"):
+    """
+    Drop-in for ``FAISS.load_local`` (same on-disk layout).
+
+    Pages of a memory-mapped index live in the OS page cache, so every
+    worker process maps the same physical memory instead of holding its
+    own deserialized copy.
+    """
+    index, mmapped = _read_index_mmap(os.path.join(folder_path, f"{index_name}.faiss"))
+
+    # Same trusted pickle that FAISS.load_local(allow_dangerous_deserialization=True) reads
+    with open(os.path.join(folder_path, f"{index_name}.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+
+    print(f"FAISS index {folder_path} loaded ({'mmap' if mmapped else 'in-heap'})")
+
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
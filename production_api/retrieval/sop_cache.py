@@ -0,0 +1,85 @@
+"""Memoized SOP recommendations keyed on the normalized (risk, counts) input."""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SopRecommendationCache:
+    """
+    LRU + TTL cache in front of the SOP similarity search.
+
+    Inputs come from a tiny domain (three risk levels, small per-class
+    counts), so almost every request after warm-up is served without
+    running the embedding model or FAISS. ``invalidate()`` must be called
+    whenever the FAISS store is reloaded; lookups that started before the
+    invalidation are not stored.
+    """
+
+    def __init__(self, lookup_fn, max_entries: int = 1024, ttl_seconds: float = 3600):
+        # lookup_fn: (risk, counts) -> recommendation text
+        self.lookup_fn = lookup_fn
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(risk, counts: dict):
+        return (str(risk).upper(), tuple(sorted((k, int(v)) for k, v in counts.items())))
+
+    def get(self, risk, counts: dict) -> str:
+        key = self.make_key(risk, counts)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        value = self.lookup_fn(risk, counts)
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return value
+
+    def prewarm(self, inputs) -> int:
+        """Populate the cache for an iterable of (risk, counts) pairs."""
+
+        warmed = 0
+        for risk, counts in inputs:
+            self.get(risk, counts)
+            warmed += 1
+        return warmed
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "generation": self._generation,
+            }
@@ -0,0 +1,71 @@
+"""Per-process memory figures (Linux /proc), for checking copy-on-write sharing."""
+
+import itertools
+import os
+import pickle
+import resource
+import sys
+
+
+def process_memory() -> dict:
+    """
+    RSS, PSS and shared memory of the current process in MB.
+
+    PSS splits shared pages between the processes mapping them, so with
+    preloaded models the per-worker PSS should sit well below its RSS.
+    """
+    fields = {}
+
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])  # kB
+    except OSError:
+        # No /proc: peak RSS only (ru_maxrss is bytes on macOS, kB elsewhere)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak /= 1024
+        return {"pid": os.getpid(), "max_rss_mb": round(peak / 1024, 1)}
+
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+
+    return {
+        "pid": os.getpid(),
+        "rss_mb": round(fields.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(fields.get("Pss", 0) / 1024, 1),
+        "shared_mb": round(shared / 1024, 1),
+    }
+
+
+def model_memory_bytes(obj) -> int:
+    """
+    Approximate in-memory size of one loaded model: parameters + buffers
+    for torch modules, stored vectors for FAISS indexes, pickled size for
+    anything else (e.g. scikit-learn estimators).
+    """
+
+    if hasattr(obj, "parameters") and hasattr(obj, "buffers"):
+        return sum(
+            t.numel() * t.element_size()
+            for t in itertools.chain(obj.parameters(), obj.buffers())
+        )
+
+    if hasattr(obj, "ntotal") and hasattr(obj, "d"):
+        return int(obj.ntotal) * int(obj.d) * 4
+
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def path_bytes(path: str) -> int:
+    """Size of a file, or of every file under a directory (exported models)."""
+
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
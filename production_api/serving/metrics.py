@@ -0,0 +1,145 @@
+"""Minimal Prometheus text-format metrics (per process, no client library)."""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Seconds; covers sub-ms hashing up to minute-long video jobs
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Route template of the request being served; copied into executor threads
+current_endpoint = ContextVar("current_endpoint", default="background")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a fixed tuple of label names."""
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self, const_labels) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+
+        with self._lock:
+            series = sorted(self._series.items())
+            series = [(key, (list(counts), total, count)) for key, (counts, total, count) in series]
+
+        for key, (counts, total, count) in series:
+            base = list(zip(self.labelnames, key)) + const_labels
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                lines.append(
+                    f"{self.name}_bucket{_labels(base + [('le', _number(bound))])} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(base)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(base)} {count}")
+
+        return lines
+
+
+class Gauge:
+    """
+    Gauge whose samples are read from ``collect()`` at scrape time.
+    ``kind="counter"`` exposes a monotonic total kept elsewhere (e.g. in a
+    component's stats) with the counter type.
+    """
+
+    def __init__(self, name: str, help: str, collect, kind: str = "gauge"):
+        # collect: () -> iterable of (labels dict, value)
+        self.name = name
+        self.help = help
+        self.collect = collect
+        self.kind = kind
+
+    def render(self, const_labels) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            samples = list(self.collect())
+        except Exception as e:
+            # A broken collector must not take the whole scrape down
+            print(f"[metrics] {self.name} collector failed: {e!r}")
+            return lines
+
+        for labels, value in samples:
+            pairs = list(labels.items()) + const_labels
+            lines.append(f"{self.name}{_labels(pairs)} {_number(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds histograms and scrape-time gauges and renders them in the
+    Prometheus text exposition format. ``const_labels`` (e.g. the model
+    version) are attached to every sample so a weights rollout shows up as
+    a new series instead of being blended into the old one.
+    """
+
+    def __init__(self, const_labels: dict = None):
+        self.const_labels = dict(const_labels or {})
+        self._metrics = []
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help, collect, kind="gauge") -> Gauge:
+        metric = Gauge(name, help, collect, kind)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        const_labels = sorted(self.const_labels.items())
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(const_labels))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,155 @@
+"""Parallel artifact loading with warm-up and readiness tracking."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupOrchestrator:
+    """
+    Load independent model artifacts concurrently, then warm each one up.
+
+    Every artifact is registered with a loader, an optional warm-up
+    callable and the names of artifacts it needs (e.g. FAISS needs the
+    embedder). ``start()`` returns immediately; loading happens on
+    background threads so the server can answer liveness probes while
+    models load. ``on_ready(artifacts)`` runs once everything is warm.
+
+    ``preload()`` loads every artifact synchronously without warming it,
+    for a parent process that forks workers afterwards; the workers'
+    ``start()`` then only runs the warm-ups.
+    """
+
+    def __init__(self, on_ready=None):
+        self.on_ready = on_ready
+
+        self._specs = {}
+        self._status = {}
+        self.artifacts = {}
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._failed = threading.Event()
+        self._started_at = None
+        self._ready_seconds = None
+
+    def add(self, name, load_fn, warmup_fn=None, depends_on=()):
+        """``load_fn(**deps)`` builds the artifact, ``warmup_fn(artifact)`` warms it."""
+
+        self._specs[name] = (load_fn, warmup_fn, tuple(depends_on))
+        self._status[name] = {
+            "state": "pending",
+            "load_seconds": None,
+            "warmup_seconds": None,
+            "error": None,
+        }
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        threading.Thread(target=self._run, name="startup", daemon=True).start()
+
+    def preload(self):
+        """Load (no warm-up) in the calling process; raises on failure."""
+
+        self._load_all(warmup=False)
+        if self.failed:
+            raise RuntimeError(f"Preloading artifacts failed: {self.status()}")
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def failed(self) -> bool:
+        return self._failed.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "failed": self.failed,
+                "ready_seconds": self._ready_seconds,
+                "artifacts": {name: dict(s) for name, s in self._status.items()},
+            }
+
+    # -----------------------
+    # Loading
+    # -----------------------
+
+    def _load_all(self, warmup):
+        # One thread per artifact; dependents block on their inputs only.
+        # The executor is joined on exit, so no thread outlives a preload fork.
+        with ThreadPoolExecutor(
+            max_workers=max(1, len(self._specs)), thread_name_prefix="load"
+        ) as executor:
+            futures = {}
+            for name, spec in self._specs.items():
+                futures[name] = executor.submit(
+                    self._load_one, name, spec, futures, warmup
+                )
+
+            for future in futures.values():
+                future.exception()
+
+    def _run(self):
+        self._load_all(warmup=True)
+
+        if self.failed:
+            return
+
+        if self.on_ready is not None:
+            try:
+                self.on_ready(dict(self.artifacts))
+            except Exception as e:
+                self._set(name="on_ready", state="failed", error=repr(e))
+                self._failed.set()
+                return
+
+        self._ready_seconds = round(time.perf_counter() - self._started_at, 3)
+        self._ready.set()
+
+    def _load_one(self, name, spec, futures, warmup=True):
+        load_fn, warmup_fn, depends_on = spec
+
+        try:
+            deps = {dep: futures[dep].result() for dep in depends_on}
+
+            if name in self.artifacts:
+                # Preloaded in the parent process; inherited copy-on-write
+                artifact = self.artifacts[name]
+            else:
+                self._set(name, state="loading")
+                started = time.perf_counter()
+                artifact = load_fn(**deps)
+                self._set(name, load_seconds=round(time.perf_counter() - started, 3))
+
+            if not warmup:
+                with self._lock:
+                    self.artifacts[name] = artifact
+                self._set(name, state="preloaded")
+                return artifact
+
+            if warmup_fn is not None:
+                self._set(name, state="warming")
+                started = time.perf_counter()
+                warmup_fn(artifact)
+                self._set(name, warmup_seconds=round(time.perf_counter() - started, 3))
+
+            with self._lock:
+                self.artifacts[name] = artifact
+            self._set(name, state="ready")
+            print(f"[startup] {name} ready: {self._status[name]}")
+            return artifact
+
+        except Exception as e:
+            self._set(name, state="failed", error=repr(e))
+            self._failed.set()
+            print(f"[startup] {name} failed: {e!r}")
+            raise
+
+    def _set(self, name, **fields):
+        with self._lock:
+            self._status.setdefault(name, {}).update(fields)
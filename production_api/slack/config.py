@@ -3,3 +3,17 @@ import os
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 SLACK_CHANNEL = os.getenv("SLACK_CHANNEL")
 SLACK_USERNAME = os.getenv("SLACK_USERNAME")
+
+# HTTP client
+SLACK_TIMEOUT = float(os.getenv("SLACK_TIMEOUT", "5"))
+SLACK_POOL_SIZE = int(os.getenv("SLACK_POOL_SIZE", "4"))
+
+# Alert dispatcher (durable queue + digest + rate limit)
+SLACK_QUEUE_PATH = os.getenv("SLACK_QUEUE_PATH", "cache/slack_alerts.sqlite3")
+SLACK_RATE_PER_SEC = float(os.getenv("SLACK_RATE_PER_SEC", "1"))
+SLACK_BURST = int(os.getenv("SLACK_BURST", "3"))
+SLACK_COALESCE_SECONDS = float(os.getenv("SLACK_COALESCE_SECONDS", "30"))
+SLACK_MAX_ATTEMPTS = int(os.getenv("SLACK_MAX_ATTEMPTS", "6"))
+# Alerts that exhausted their retries are kept this long, at most SLACK_MAX_DEAD of them
+SLACK_DEAD_RETENTION_HOURS = float(os.getenv("SLACK_DEAD_RETENTION_HOURS", "168"))
+SLACK_MAX_DEAD = int(os.getenv("SLACK_MAX_DEAD", "1000"))
@@ -0,0 +1,361 @@
+"""Durable, coalescing, rate-limited Slack alert dispatcher."""
+
+import fcntl
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from .config import SLACK_WEBHOOK_URL
+from .notifier import build_alert_payload, build_digest_payload
+from .slack_client import post_message
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    shipment_id TEXT    NOT NULL,
+    alert       TEXT    NOT NULL,
+    created_at  REAL    NOT NULL,
+    due_at      REAL    NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    status      TEXT    NOT NULL DEFAULT 'pending',
+    last_error  TEXT
+);
+CREATE INDEX IF NOT EXISTS alerts_due ON alerts (status, due_at);
+"""
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 1e-6)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def acquire(self, stop: threading.Event) -> bool:
+        """Block until a token is available; False if ``stop`` was set meanwhile."""
+
+        while not stop.is_set():
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+
+            stop.wait((1 - self._tokens) / self.rate)
+
+        return False
+
+    def pause(self, seconds: float):
+        """Drain the bucket so nothing is sent for ``seconds`` (Slack 429)."""
+
+        self._tokens = -seconds * self.rate
+        self._updated = time.monotonic()
+
+
+class AlertDispatcher:
+    """
+    Send Slack alerts off the request path.
+
+    ``enqueue()`` is a single SQLite insert. A background thread sends due
+    alerts over the pooled Slack session: alerts for the same shipment that
+    arrive within ``coalesce_seconds`` go out as one digest, sends are
+    token-bucket rate limited, and failures are retried with exponential
+    backoff (honouring Slack's Retry-After) up to ``max_attempts``. With
+    several workers sharing one queue file, only the worker holding the
+    queue lock sends; the others just enqueue.
+
+    Sent alerts are deleted right away; alerts that gave up (``dead``) are
+    kept for inspection for ``dead_retention_seconds``, at most ``max_dead``
+    of them. Without a webhook URL nothing is queued or sent.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        rate_per_sec: float = 1.0,
+        burst: int = 3,
+        coalesce_seconds: float = 30.0,
+        max_attempts: int = 6,
+        poll_interval: float = 0.5,
+        webhook_url: str = None,
+        on_send=None,
+        dead_retention_seconds: float = 7 * 86400,
+        max_dead: int = 1000,
+        prune_interval: float = 60.0,
+    ):
+        # on_send(seconds, ok): optional hook to observe send latency
+        self.db_path = db_path
+        self.on_send = on_send
+        self.coalesce_seconds = max(0.0, float(coalesce_seconds))
+        self.max_attempts = max(1, int(max_attempts))
+        self.poll_interval = poll_interval
+        self.webhook_url = webhook_url or SLACK_WEBHOOK_URL
+        self.dead_retention_seconds = max(0.0, float(dead_retention_seconds))
+        self.max_dead = max(0, int(max_dead))
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+
+        self._bucket = TokenBucket(rate_per_sec, burst)
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock_file = None
+
+        self.sent_messages = 0
+        self.sent_alerts = 0
+        self.failed_attempts = 0
+        self.skipped_alerts = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    # -----------------------
+    # Producer side
+    # -----------------------
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.webhook_url)
+
+    def enqueue(self, shipment_id: str, **alert) -> int:
+        """Persist one alert (``send_alert`` keyword arguments); returns its id.
+
+        Returns None without a webhook URL: the alert could never be sent.
+        """
+
+        if not self.enabled:
+            self.skipped_alerts += 1
+            return None
+
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO alerts (shipment_id, alert, created_at, due_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    shipment_id,
+                    json.dumps({"shipment_id": shipment_id, **alert}, default=float),
+                    now,
+                    now + self.coalesce_seconds,
+                ),
+            )
+        self._wakeup.set()
+        return cursor.lastrowid
+
+    # -----------------------
+    # Lifecycle
+    # -----------------------
+
+    def start(self):
+        if not self.enabled:
+            print("[slack] SLACK_WEBHOOK_URL is not set; alerts are disabled")
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="slack-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM alerts GROUP BY status"
+            ).fetchall()
+        return {
+            "enabled": self.enabled,
+            "leader": self._lock_file is not None,
+            "queued": dict(rows),
+            "sent_messages": self.sent_messages,
+            "sent_alerts": self.sent_alerts,
+            "failed_attempts": self.failed_attempts,
+            "skipped_alerts": self.skipped_alerts,
+        }
+
+    # -----------------------
+    # Dispatch loop
+    # -----------------------
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived connection per call: enqueue runs on arbitrary threads
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _become_leader(self) -> bool:
+        if self._lock_file is not None:
+            return True
+
+        lock_file = open(self.db_path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        # Alerts claimed by a previous leader that died mid-send
+        with self._connect() as conn:
+            conn.execute("UPDATE alerts SET status = 'pending' WHERE status = 'sending'")
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._become_leader():
+                self._stop.wait(5.0)
+                continue
+
+            try:
+                self._prune_dead()
+                sent_any = self._dispatch_next()
+            except Exception as e:
+                print(f"[slack] dispatcher error: {e!r}")
+                sent_any = False
+
+            if not sent_any:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _dispatch_next(self) -> bool:
+        now = time.time()
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT shipment_id FROM alerts WHERE status = 'pending' AND due_at <= ? "
+                "ORDER BY due_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return False
+
+            shipment_id = row[0]
+            # Everything pending for this shipment joins the digest
+            rows = conn.execute(
+                "SELECT id, alert, attempts FROM alerts "
+                "WHERE status = 'pending' AND shipment_id = ? ORDER BY created_at",
+                (shipment_id,),
+            ).fetchall()
+            ids = [r[0] for r in rows]
+            conn.execute(
+                f"UPDATE alerts SET status = 'sending' WHERE id IN ({_marks(ids)})", ids
+            )
+
+        alerts = [json.loads(r[1]) for r in rows]
+        attempts = max(r[2] for r in rows) + 1
+
+        if not self._bucket.acquire(self._stop):
+            self._release(ids)
+            return False
+
+        if len(alerts) == 1:
+            payload = build_alert_payload(**alerts[0])
+        else:
+            payload = build_digest_payload(shipment_id, alerts)
+
+        retry_after = None
+        started = time.perf_counter()
+        try:
+            response = post_message(payload, self.webhook_url)
+            self._observe_send(started, 200 <= response.status_code < 300)
+            if 200 <= response.status_code < 300:
+                self._delete(ids)
+                self.sent_messages += 1
+                self.sent_alerts += len(ids)
+                return True
+
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            if response.status_code == 429:
+                retry_after = float(response.headers.get("Retry-After", "1"))
+                self._bucket.pause(retry_after)
+        except Exception as e:
+            self._observe_send(started, False)
+            error = repr(e)
+
+        self.failed_attempts += 1
+        self._reschedule(ids, attempts, error, retry_after)
+        return True
+
+    def _observe_send(self, started, ok):
+        if self.on_send is None:
+            return
+        try:
+            self.on_send(time.perf_counter() - started, ok)
+        except Exception as e:
+            print(f"[slack] on_send hook failed: {e!r}")
+
+    def _backoff(self, attempts: int) -> float:
+        # 2, 4, 8, ... seconds capped at 5 minutes, with jitter
+        return min(300.0, 2.0 ** attempts) * random.uniform(0.8, 1.2)
+
+    def _reschedule(self, ids, attempts, error, retry_after=None):
+        status = "dead" if attempts >= self.max_attempts else "pending"
+        due_at = time.time() + (retry_after or self._backoff(attempts))
+
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE alerts SET status = ?, attempts = ?, due_at = ?, last_error = ? "
+                f"WHERE id IN ({_marks(ids)})",
+                [status, attempts, due_at, error, *ids],
+            )
+
+        if status == "dead":
+            print(f"[slack] giving up on alerts {ids}: {error}")
+
+    def _prune_dead(self):
+        """Drop expired dead alerts and cap how many are kept (leader only)."""
+
+        now = time.time()
+        if now - self._pruned_at < self.prune_interval:
+            return
+        self._pruned_at = now
+
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM alerts WHERE status = 'dead' AND created_at < ?",
+                (now - self.dead_retention_seconds,),
+            )
+            conn.execute(
+                "DELETE FROM alerts WHERE status = 'dead' AND id NOT IN "
+                "(SELECT id FROM alerts WHERE status = 'dead' ORDER BY id DESC LIMIT ?)",
+                (self.max_dead,),
+            )
+
+    def _release(self, ids):
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE alerts SET status = 'pending' WHERE id IN ({_marks(ids)})", ids
+            )
+
+    def _delete(self, ids):
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM alerts WHERE id IN ({_marks(ids)})", ids)
+
+
+def _marks(ids) -> str:
+    return ", ".join("?" for _ in ids)
@@ -4,7 +4,15 @@ from slack.thresholds import THRESHOLD_VERSION
 from .slack_client import send_message
 
 
-def send_alert(
+EMOJI_MAP = {"CRITICAL": "🚨", "WARNING": "⚠️", "INFO": "ℹ️"}
+
+# Highest first, used to pick the headline level of a digest
+LEVEL_ORDER = {"CRITICAL": 3, "WARNING": 2, "INFO": 1}
+
+DIGEST_MAX_LINES = 15
+
+
+def build_alert_payload(
     shipment_id: str,
     severity_score: float,
     alert_level: str,
@@ -18,8 +26,7 @@ def send_alert(
     # Emoji mapping
     # -----------------------
 
-    emoji_map = {"CRITICAL": "🚨", "WARNING": "⚠️", "INFO": "ℹ️"}
-    emoji = emoji_map.get(alert_level, "🔎")
+    emoji = EMOJI_MAP.get(alert_level, "🔎")
 
     # -----------------------
     # Detection summary text
@@ -83,4 +90,103 @@ def send_alert(
         ]
     }
 
+    return payload
+
+
+def build_digest_payload(shipment_id: str, alerts: list):
+    """One Slack message summarizing a burst of alerts for the same shipment."""
+
+    top = max(
+        alerts,
+        key=lambda a: (LEVEL_ORDER.get(a["alert_level"], 0), a["severity_score"]),
+    )
+    emoji = EMOJI_MAP.get(top["alert_level"], "🔎")
+
+    total_counts = {}
+    for alert in alerts:
+        for k, v in alert["damage_counts"].items():
+            total_counts[k] = total_counts.get(k, 0) + v
+
+    summary_text = ", ".join([f"{k}: {v}" for k, v in total_counts.items()])
+    if not summary_text:
+        summary_text = "No damages detected."
+
+    # Slack caps a text block at 3000 chars; list the first few only
+    alert_lines = "\n".join(
+        f"• `{a['alert_level']}` {a['severity_score']:.4f} — {a['class_name']} ({a['image_name']})"
+        for a in alerts[:DIGEST_MAX_LINES]
+    )
+    if len(alerts) > DIGEST_MAX_LINES:
+        alert_lines += f"\n… and {len(alerts) - DIGEST_MAX_LINES} more"
+
+    payload = {
+        "blocks": [
+            {
+                "type": "header",
+                "text": {
+                    "type": "plain_text",
+                    "text": f"{emoji} Container Damage Digest: {top['alert_level']} ({len(alerts)} alerts)",
+                },
+            },
+            {
+                "type": "section",
+                "fields": [
+                    {"type": "mrkdwn", "text": f"*Shipment ID:*\n`{shipment_id}`"},
+                    {
+                        "type": "mrkdwn",
+                        "text": f"*Max Severity Score:*\n`{top['severity_score']:.4f}`",
+                    },
+                ],
+            },
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*Detections Summary:*\n{summary_text}\n\n*Alerts:*\n{alert_lines}",
+                },
+            },
+            {"type": "divider"},
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*📋 SOP Recommendation:*\n{top['sop_recommendation']}",
+                },
+            },
+            {
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"Model: YOLOv8 + Severity Engine | Threshold: {THRESHOLD_VERSION}",
+                    }
+                ],
+            },
+        ]
+    }
+
+    return payload
+
+
+def send_alert(
+    shipment_id: str,
+    severity_score: float,
+    alert_level: str,
+    class_name: str,
+    damage_counts: dict,
+    sop_recommendation: str,
+    image_name: str,
+):
+    """Synchronous send (blocks on Slack). The API uses the AlertDispatcher instead."""
+
+    payload = build_alert_payload(
+        shipment_id=shipment_id,
+        severity_score=severity_score,
+        alert_level=alert_level,
+        class_name=class_name,
+        damage_counts=damage_counts,
+        sop_recommendation=sop_recommendation,
+        image_name=image_name,
+    )
+
     return send_message(payload)
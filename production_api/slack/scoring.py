@@ -0,0 +1,88 @@
+"""
+Vectorized risk / alert scoring engine.
+
+One policy (THRESHOLDS, CLASS_WEIGHT, DAMAGE_SEVERITY_WEIGHT,
+RISK_THRESHOLDS, THRESHOLD_VERSION) applied to whole arrays at once, so the
+API, the video path and offline backfills share the same scoring:
+
+    engine = ScoringEngine(["dent", "rust", "broken_door", "leak"])
+    severity = engine.severity(df[engine.class_names].to_numpy())
+    risk = engine.risk_level(severity)
+    final, level = engine.alert_scores(df["base_score"], df["dominant_class_id"])
+"""
+
+import numpy as np
+
+from slack.thresholds import (
+    THRESHOLD_VERSION,
+    THRESHOLDS,
+    CLASS_WEIGHT,
+    DAMAGE_SEVERITY_WEIGHT,
+    RISK_THRESHOLDS,
+)
+
+RISK_LEVELS = np.array(["LOW", "MEDIUM", "HIGH"], dtype=object)
+ALERT_LEVELS = np.array([None, "INFO", "WARNING", "CRITICAL"], dtype=object)
+
+
+class ScoringEngine:
+    """Policy lookups precomputed as arrays aligned to ``class_names``."""
+
+    def __init__(
+        self,
+        class_names,
+        thresholds: dict = THRESHOLDS,
+        class_weight: dict = CLASS_WEIGHT,
+        severity_weight: dict = DAMAGE_SEVERITY_WEIGHT,
+        risk_thresholds: dict = RISK_THRESHOLDS,
+        version: str = THRESHOLD_VERSION,
+    ):
+        self.class_names = list(class_names)
+        self.version = version
+
+        self.severity_weights = np.array(
+            [severity_weight.get(name, 0) for name in self.class_names], dtype=np.int64
+        )
+        self.class_weights = np.array(
+            [class_weight.get(name, 1.0) for name in self.class_names], dtype=np.float64
+        )
+
+        # Ascending edges; searchsorted(side="right") == "score >= edge" count
+        self.alert_edges = np.array(
+            [thresholds["low"], thresholds["medium"], thresholds["high"]],
+            dtype=np.float64,
+        )
+        self.risk_edges = np.array(
+            [risk_thresholds["medium"], risk_thresholds["high"]], dtype=np.float64
+        )
+
+    # -----------------------
+    # Count-based risk engine
+    # -----------------------
+
+    def severity(self, counts) -> np.ndarray:
+        """(n, C) or (C,) per-class counts -> weighted severity per row."""
+        return np.asarray(counts, dtype=np.int64) @ self.severity_weights
+
+    def risk_level(self, severity) -> np.ndarray:
+        idx = np.searchsorted(self.risk_edges, np.asarray(severity), side="right")
+        return RISK_LEVELS[idx]
+
+    # -----------------------
+    # Severity-model alerting
+    # -----------------------
+
+    def apply_class_weight(self, scores, class_ids) -> np.ndarray:
+        return np.asarray(scores, dtype=np.float64) * self.class_weights[
+            np.asarray(class_ids, dtype=np.int64)
+        ]
+
+    def classify_alert(self, scores) -> np.ndarray:
+        """Alert level per score (None below the ``low`` threshold)."""
+        idx = np.searchsorted(self.alert_edges, np.asarray(scores), side="right")
+        return ALERT_LEVELS[idx]
+
+    def alert_scores(self, base_scores, dominant_class_ids):
+        """Class-weighted final scores and their alert levels."""
+        final = self.apply_class_weight(base_scores, dominant_class_ids)
+        return final, self.classify_alert(final)
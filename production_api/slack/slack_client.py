@@ -1,12 +1,37 @@
 import requests
-from .config import SLACK_WEBHOOK_URL
+from requests.adapters import HTTPAdapter
 
+from .config import SLACK_WEBHOOK_URL, SLACK_TIMEOUT, SLACK_POOL_SIZE
 
-def send_message(payload: dict):
+_session = None
+
+
+def get_session() -> requests.Session:
+    """Persistent pooled session (created lazily, so it is safe across fork)."""
+
+    global _session
+
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SLACK_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+
+    return _session
 
-    if not SLACK_WEBHOOK_URL:
+
+def post_message(payload: dict, webhook_url: str = None) -> requests.Response:
+
+    url = webhook_url or SLACK_WEBHOOK_URL
+    if not url:
         raise ValueError("SLACK_WEBHOOK_URL is not set")
 
-    response = requests.post(SLACK_WEBHOOK_URL, json=payload, timeout=5)
+    return get_session().post(url, json=payload, timeout=SLACK_TIMEOUT)
+
+
+def send_message(payload: dict):
+
+    response = post_message(payload)
 
     return response.status_code
@@ -0,0 +1,63 @@
+"""
+Local stand-in for a Slack incoming webhook, for exercising the dispatcher.
+
+    python -m slack.stub_webhook --port 8765 --fail-every 3
+    SLACK_WEBHOOK_URL=http://127.0.0.1:8765/ uvicorn app:app
+
+Every received payload is printed. ``--fail-every N`` answers every Nth
+request with 429 + Retry-After, like Slack's rate limiter.
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(fail_every: int, retry_after: int):
+
+    state = {"requests": 0}
+
+    class StubWebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            state["requests"] += 1
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            if fail_every and state["requests"] % fail_every == 0:
+                self.send_response(429)
+                self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(b"rate_limited")
+                print(f"#{state['requests']} -> 429")
+                return
+
+            payload = json.loads(body or b"{}")
+            header = payload.get("blocks", [{}])[0].get("text", {}).get("text")
+            print(f"#{state['requests']} -> 200 {header}")
+
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubWebhookHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port), make_handler(args.fail_every, args.retry_after)
+    )
+    print(f"Stub Slack webhook on http://{args.host}:{args.port}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
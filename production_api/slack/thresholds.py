@@ -17,21 +17,35 @@ CLASS_WEIGHT = {"dent": 1.0, "rust": 1.2, "leak": 1.5, "broken_door": 1.7}
 
 ALERT_POLICY = {"send_info": False, "send_warning": True, "send_critical": True}
 
+# Count-based damage severity (risk engine)
+DAMAGE_SEVERITY_WEIGHT = {"dent": 1, "rust": 2, "broken_door": 3, "leak": 4}
 
-# Create function to get classify alert level based on severity score
+RISK_THRESHOLDS = {"medium": 2, "high": 5}
+
+
+_ENGINE = None
+
+
+def _engine():
+    """Shared ScoringEngine over this policy (imported lazily: scoring imports this module)."""
+
+    global _ENGINE
+    if _ENGINE is None:
+        from slack.scoring import ScoringEngine
+
+        _ENGINE = ScoringEngine(CLASS_WEIGHT)
+    return _ENGINE
+
+
+# Scalar helpers kept for callers of the old API; the policy lives in ScoringEngine
 def classify_alert(score: float):
     """Classify alert level based on severity score"""
-    if score >= THRESHOLDS["high"]:
-        return "CRITICAL"
-    elif score >= THRESHOLDS["medium"]:
-        return "WARNING"
-    elif score >= THRESHOLDS["low"]:
-        return "INFO"
-    else:
-        return None
+    return _engine().classify_alert(score)
 
 
 def apply_class_weight(score: float, class_name: str):
     """Apply class weight to severity score"""
-    weight = CLASS_WEIGHT.get(class_name, 1.0)
-    return score * weight
+    engine = _engine()
+    if class_name not in engine.class_names:
+        return score
+    return float(engine.apply_class_weight(score, engine.class_names.index(class_name)))
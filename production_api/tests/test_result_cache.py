@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from inference.detections import DetectionBatch
+from inference.result_cache import InferenceResultCache
+
+
+def _container_image(h=480, w=640):
+    # Smooth gradient plus a dark block: stable dHash under resizing
+    image = np.zeros((h, w, 3), dtype=np.uint8)
+    image[:] = np.linspace(0, 255, w, dtype=np.uint8)[None, :, None]
+    image[h // 4 : h // 2, w // 4 : w // 2] = 20
+    return image
+
+
+def _detections(image):
+    data = np.array([[160, 120, 320, 240, 0.9, 1]], dtype=np.float32)
+    return DetectionBatch.from_data(data, image.shape)
+
+
+def test_near_hit_on_resized_copy_is_rescaled():
+    cache = InferenceResultCache(max_distance=6, rescale=DetectionBatch.rescaled)
+    original = _container_image()
+    cache.put(cache.fingerprint(original), _detections(original))
+
+    resized = cv2.resize(original, (320, 240), interpolation=cv2.INTER_AREA)
+    hit = cache.get(cache.fingerprint(resized), "test")
+
+    assert hit is not None
+    assert cache.stats()["endpoints"]["test"]["near"] == 1
+    np.testing.assert_allclose(hit.xyxy, [[80, 60, 160, 120]])
+    np.testing.assert_allclose(hit.area_ratios, _detections(original).area_ratios)
+
+
+def test_near_hit_without_rescale_requires_same_shape():
+    cache = InferenceResultCache(max_distance=6)
+    original = _container_image()
+    cache.put(cache.fingerprint(original), _detections(original))
+
+    resized = cv2.resize(original, (320, 240), interpolation=cv2.INTER_AREA)
+    assert cache.get(cache.fingerprint(resized), "test") is None
+
+    reencoded = cv2.imdecode(cv2.imencode(".jpg", original)[1], cv2.IMREAD_COLOR)
+    assert cache.get(cache.fingerprint(reencoded), "test") is not None
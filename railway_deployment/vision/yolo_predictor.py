@@ -3,7 +3,43 @@ import os
 import pathlib
 
 MODEL_PATH = pathlib.Path(__file__).parent / "models" / "yolov8.pt"
-model = YOLO(MODEL_PATH)
+
+# Serving backend: torch (.pt), onnx (ONNX Runtime) or openvino, all on CPU
+YOLO_BACKEND = os.getenv("YOLO_BACKEND", "torch").lower()
+YOLO_INT8 = os.getenv("YOLO_INT8", "false").lower() == "true"
+
+
+def resolve_model_path():
+    """Exported model next to the .pt (same naming as production_api/inference/backends.py)."""
+    if YOLO_BACKEND == "torch":
+        return MODEL_PATH
+
+    suffix = "_int8" if YOLO_INT8 else ""
+    if YOLO_BACKEND == "onnx":
+        exported = MODEL_PATH.with_name(f"{MODEL_PATH.stem}{suffix}.onnx")
+    elif YOLO_BACKEND == "openvino":
+        exported = MODEL_PATH.with_name(f"{MODEL_PATH.stem}{suffix}_openvino_model")
+    else:
+        raise ValueError(f"Unknown YOLO_BACKEND {YOLO_BACKEND!r} (torch, onnx, openvino)")
+
+    if not exported.exists():
+        if YOLO_INT8:
+            # Calibrated int8 needs the dataset, export it ahead of time
+            raise FileNotFoundError(
+                f"{exported} not found. Run `python -m inference.backends export "
+                f"--weights {MODEL_PATH} --backend {YOLO_BACKEND} --int8` from production_api."
+            )
+        produced = YOLO(MODEL_PATH).export(format=YOLO_BACKEND, dynamic=True)
+        if pathlib.Path(produced).resolve() != exported.resolve():
+            os.replace(produced, exported)
+
+    return exported
+
+
+if YOLO_BACKEND == "torch":
+    model = YOLO(MODEL_PATH)
+else:
+    model = YOLO(resolve_model_path(), task="detect")
 
 
 # Create a function to make predictions